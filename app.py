@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 
 import constants as C
 from services import data as data_service
+from services import _singleton
 from ui import contracts_tab, map_tab, financial_tab, forecast_tab, opportunity_tab, partners_tab, unit_analysis_tab
 
 # Setup Logging
@@ -29,6 +30,7 @@ st.sidebar.image("Ativo 10.png", use_container_width=True)
 st.sidebar.title(C.APP_TITLE)
 if st.sidebar.button(C.UI_LABEL_RELOAD_DATA):
     st.cache_data.clear()
+    _singleton.clear_all()
     st.rerun()
 
 dados = data_service.get_dados(DEFAULT_SHEET_ID)
@@ -227,6 +227,7 @@ UI_LABEL_SIGNED_BY_MONTH = "Contratos assinados por mês"
 UI_LABEL_MONTH = "Mês"
 UI_LABEL_CONTRACTS = "Contratos"
 UI_LABEL_DAILY_SALES = "Vendas Diárias"
+UI_LABEL_NO_CONTRACTS_FOUND = "Nenhum contrato encontrado com os filtros atuais."
 
 # Financial Tab UI
 UI_LABEL_REVENUE_TODAY = "Faturamento hoje"
@@ -270,6 +271,7 @@ UI_LABEL_FORECAST_REVENUE = "Faturamento previsto"
 UI_LABEL_FORECAST_REVENUE_TITLE = "Previsão de Faturamento Diário"
 UI_LABEL_ERROR_FORECAST = "Erro ao gerar previsão"
 UI_LABEL_TIP_INSTALL = "Dica: Verifique se as bibliotecas 'prophet' e 'statsmodels' estão instaladas."
+UI_LABEL_GENERATING_FORECAST = "Gerando previsão..."
 
 # Partners Tab UI
 UI_LABEL_ACCESS_KEY = "Chave de acesso"
@@ -390,3 +392,4 @@ API_URL_SIDRA_POP_2022_ALL = "https://apisidra.ibge.gov.br/values/t/6579/n6/all/
 GEO_DB_PATH = "geocache.db"
 GEO_USER_AGENT = "educa-mais-dashboard-v2"
 GEO_COUNTRY = "Brasil"
+GEO_FAILURE_TTL = 3600  # seconds a timed-out lookup is not retried
@@ -1,26 +1,70 @@
 import pandas as pd
 import numpy as np
-from datetime import timedelta, date
 import logging
 import math
+import importlib.util
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import constants as C
 
-try:
-    from prophet import Prophet
+# Prophet/statsmodels are slow to import, so only check that they are
+# installed here and import them on first use (see `_load_prophet` and
+# `_load_exponential_smoothing`).
+PROPHET_AVAILABLE = importlib.util.find_spec("prophet") is not None
+STATSMODELS_AVAILABLE = importlib.util.find_spec("statsmodels") is not None
 
-    PROPHET_AVAILABLE = True
-except ImportError:
-    PROPHET_AVAILABLE = False
-
-try:
-    from statsmodels.tsa.holtwinters import ExponentialSmoothing
-
-    STATSMODELS_AVAILABLE = True
-except ImportError:
-    STATSMODELS_AVAILABLE = False
+Prophet = None
+ExponentialSmoothing = None
 
 logger = logging.getLogger(__name__)
 
+# Shared noise generator (PCG64) for unseeded forecasts: created once instead
+# of seeding a fresh one from OS entropy per call. Its draws are serialized
+# by the bit generator's lock, so concurrent forecasts can share it.
+_RNG = np.random.default_rng()
+
+# Category order doubles as the codes used for the `Type` column (0/1)
+_TYPE_CATEGORIES = [C.UI_LABEL_HISTORY, C.UI_LABEL_FORECAST]
+
+# Small LRU of finished forecasts: Streamlit reruns call `generate_forecast`
+# with identical inputs, and refitting Prophet/Holt-Winters takes seconds.
+_FORECAST_CACHE_SIZE = 32
+_FORECAST_CACHE: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_FORECAST_CACHE_LOCK = threading.Lock()
+
+# Fitted Prophet/Holt-Winters models keyed on (model class, training data):
+# fitting dominates wall time and does not depend on the horizon.
+_MODEL_CACHE_SIZE = 8
+_MODEL_CACHE: "OrderedDict[tuple, object]" = OrderedDict()
+
+
+def _load_prophet():
+    """Imports `Prophet` on first use and caches it at module level."""
+    global Prophet
+    if Prophet is None:
+        try:
+            from prophet import Prophet as _Prophet
+        except ImportError:
+            raise ImportError(C.ERR_MSG_PROPHET_NOT_INSTALLED)
+        Prophet = _Prophet
+    return Prophet
+
+
+def _load_exponential_smoothing():
+    """Imports `ExponentialSmoothing` on first use and caches it at module level."""
+    global ExponentialSmoothing
+    if ExponentialSmoothing is None:
+        try:
+            from statsmodels.tsa.holtwinters import (
+                ExponentialSmoothing as _ExponentialSmoothing,
+            )
+        except ImportError:
+            raise ImportError(C.ERR_MSG_STATSMODELS_NOT_INSTALLED)
+        ExponentialSmoothing = _ExponentialSmoothing
+    return ExponentialSmoothing
+
 
 def generate_forecast(
     df: pd.DataFrame,
@@ -28,7 +72,11 @@ def generate_forecast(
     value_col: str,
     algorithm: str,
     full_horizon_days: int,
-) -> pd.DataFrame:
+    seed: int | None = None,
+    rng: np.random.Generator | None = None,
+    include_type: bool = True,
+    return_daily: bool = False,
+):
     """
     Generates a forecast DataFrame appended to the historical data using Prophet or Holt-Winters.
 
@@ -47,31 +95,182 @@ def generate_forecast(
         value_col (str): The name of the column containing the target numeric values to forecast.
         algorithm (str): The algorithm to use. Options: 'Prophet' or 'Holt-Winters'.
         full_horizon_days (int): The number of days to forecast into the future.
+        seed (int | None, optional): Seed for the noise generator, for reproducible runs
+            (e.g. backtests). Defaults to None (draws from the shared module generator).
+        rng (np.random.Generator | None, optional): Generator to draw the noise from,
+            taking precedence over `seed`. Calls passing one bypass the result cache,
+            since the output then depends on the generator's state.
+        include_type (bool, optional): If False, skip the 'Type' column and return
+            `(df, hist_len)` instead: rows `[:hist_len]` are history, the rest forecast.
+            For internal callers that slice by position. Defaults to True.
+        return_daily (bool, optional): If True, return `(forecast, daily)`, where
+            `forecast` is what would be returned otherwise and `daily` is the gap-free
+            daily history it was fitted on, for `generate_smart_insights(daily=...)`.
+            Defaults to False.
 
     Returns:
         pd.DataFrame: A new DataFrame containing both historical data and the generated forecast.
                       It includes a 'Type' column distinguishing 'Histórico' from 'Previsão'.
                       For 'Previsão' rows, the 'value_col' contains the predicted values (adjusted).
+                      The horizon/history totals are kept in `attrs["forecast_summary"]`
+                      ("future_sum", "future_mean", "history_sum").
+                      Identical calls are served from a small in-memory LRU.
+        tuple[pd.DataFrame, int]: With `include_type=False`, the frame without the
+                      'Type' column and the number of history rows.
     
     Raises:
         ImportError: If the selected algorithm library (prophet or statsmodels) is not installed.
     """
+    if rng is not None:
+        daily = _prepare_daily(df, date_col, value_col)
+        result = _generate_forecast_from_daily(
+            daily,
+            date_col,
+            value_col,
+            algorithm,
+            full_horizon_days,
+            rng=rng,
+            include_type=include_type,
+        )
+        return (result, daily) if return_daily else result
+
+    key = (
+        _fingerprint(df, date_col, value_col),
+        date_col,
+        value_col,
+        algorithm,
+        full_horizon_days,
+        seed,
+        include_type,
+    )
+    with _FORECAST_CACHE_LOCK:
+        cached = _FORECAST_CACHE.get(key)
+        if cached is not None:
+            _FORECAST_CACHE.move_to_end(key)
+    if cached is not None:
+        # Callers get their own copy so the cached frames can't be mutated
+        result, daily = cached
+        return (_copy_result(result), daily.copy()) if return_daily else _copy_result(result)
+
+    daily = _prepare_daily(df, date_col, value_col)
+    result = _generate_forecast_from_daily(
+        daily,
+        date_col,
+        value_col,
+        algorithm,
+        full_horizon_days,
+        seed=seed,
+        include_type=include_type,
+    )
+    # The daily history is cached next to the result rather than in its
+    # `attrs`, which pandas would deep-copy into every derived frame
+    with _FORECAST_CACHE_LOCK:
+        _FORECAST_CACHE[key] = (result, daily)
+        _FORECAST_CACHE.move_to_end(key)
+        while len(_FORECAST_CACHE) > _FORECAST_CACHE_SIZE:
+            _FORECAST_CACHE.popitem(last=False)
+    return (_copy_result(result), daily.copy()) if return_daily else _copy_result(result)
+
+
+def _copy_result(result):
+    if isinstance(result, tuple):
+        frame, hist_len = result
+        return frame.copy(), hist_len
+    return result.copy()
+
+
+def clear_forecast_cache() -> None:
+    """Drops every memoized `generate_forecast` result and fitted model."""
+    with _FORECAST_CACHE_LOCK:
+        _FORECAST_CACHE.clear()
+        _MODEL_CACHE.clear()
+
+
+def _fingerprint(df: pd.DataFrame, date_col: str, value_col: str) -> str:
+    """Content hash of the two columns a forecast depends on."""
+    try:
+        dates = df[date_col].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        values = df[value_col].to_numpy(dtype=np.float64).view(np.uint64)
+    except (TypeError, ValueError):
+        # Columns that don't convert cleanly (e.g. object/strings)
+        return _content_hash(df[[date_col, value_col]])
+    # hash_array on the raw buffers skips hash_pandas_object's per-column
+    # dispatch and index handling
+    h = hashlib.blake2b(digest_size=16)
+    h.update(pd.util.hash_array(dates).tobytes())
+    h.update(pd.util.hash_array(values).tobytes())
+    return h.hexdigest()
+
+
+def _content_hash(obj) -> str:
+    hashed = pd.util.hash_pandas_object(obj, index=False)
+    return hashlib.blake2b(hashed.to_numpy().tobytes(), digest_size=16).hexdigest()
+
+
+def _fit_cached(model_cls, train, fit):
+    """
+    Returns the fitted model for `train`, calling `fit()` only on a miss.
+
+    The fit does not depend on the horizon, so backtests and reruns that differ
+    only in `full_horizon_days` reuse it. The model class is part of the key,
+    so a different (e.g. patched) class never sees another class's model.
+    """
+    key = (model_cls, _content_hash(train))
+    with _FORECAST_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is not None:
+            _MODEL_CACHE.move_to_end(key)
+            return model
+
+    model = fit()
+    with _FORECAST_CACHE_LOCK:
+        _MODEL_CACHE[key] = model
+        while len(_MODEL_CACHE) > _MODEL_CACHE_SIZE:
+            _MODEL_CACHE.popitem(last=False)
+    return model
+
+
+def _prepare_daily(df: pd.DataFrame, date_col: str, value_col: str) -> pd.DataFrame:
+    """Aggregates `value_col` per day and fills missing days with 0."""
     # Prepare Base Data (Daily Aggregation)
     daily = df.groupby(df[date_col].dt.date)[value_col].sum().reset_index()
     daily[date_col] = pd.to_datetime(daily[date_col])
     daily = daily.sort_values(date_col)
 
+    # Already one row per consecutive day (the common case): nothing to fill
+    days = daily[date_col].to_numpy(dtype="datetime64[D]")
+    if days.size and (np.diff(days) == np.timedelta64(1, "D")).all():
+        return daily.reset_index(drop=True)
+
     # Fill missing days with 0 to have a continuous time series
     idx = pd.date_range(daily[date_col].min(), daily[date_col].max())
     daily = daily.set_index(date_col).reindex(idx, fill_value=0).reset_index()
     daily = daily.rename(columns={"index": date_col})
+    return daily
+
+
+def _generate_forecast_from_daily(
+    daily: pd.DataFrame,
+    date_col: str,
+    value_col: str,
+    algorithm: str,
+    full_horizon_days: int,
+    seed: int | None = None,
+    rng: np.random.Generator | None = None,
+    include_type: bool = True,
+) -> pd.DataFrame | tuple[pd.DataFrame, int]:
+    """
+    Fits the model and applies the post-processing of `generate_forecast` on a
+    series already prepared by `_prepare_daily` (one row per day, no gaps).
+    """
+    if rng is None:
+        rng = _RNG if seed is None else np.random.default_rng(seed)
 
     # Generate Future Dates
     last_date = daily[date_col].max()
-    future_dates = [
-        last_date + timedelta(days=x) for x in range(1, full_horizon_days + 1)
-    ]
-    future_df = pd.DataFrame({date_col: future_dates})
+    future_dates = pd.date_range(
+        start=last_date + pd.Timedelta(days=1), periods=full_horizon_days, freq="D"
+    )
 
     forecast_values = []
 
@@ -86,14 +285,23 @@ def generate_forecast(
         # Prepare Data for Prophet (ds, y)
         p_df = daily.rename(columns={date_col: "ds", value_col: "y"})
 
-        m = Prophet(daily_seasonality=True, yearly_seasonality=False)
-        m.fit(p_df)
+        # Only `yhat` is consumed below, so skip the posterior sampling that
+        # `.predict` would otherwise run (yhat_lower/yhat_upper become meaningless).
+        prophet_cls = _load_prophet()
+
+        def _fit_prophet():
+            m = prophet_cls(
+                daily_seasonality=True, yearly_seasonality=False, uncertainty_samples=0
+            )
+            m.fit(p_df)
+            return m
 
-        future = m.make_future_dataframe(periods=full_horizon_days)
-        forecast = m.predict(future)
+        m = _fit_cached(prophet_cls, p_df, _fit_prophet)
 
-        # Extract only future part
-        forecast_values = forecast.tail(full_horizon_days)["yhat"].values
+        # Predict only the horizon, reusing the dates built above, instead of
+        # `make_future_dataframe` (history + future) and keeping the tail
+        forecast = m.predict(future_dates.to_frame(index=False, name="ds"))
+        forecast_values = forecast["yhat"].to_numpy()
 
     elif algorithm == C.ALGORITHM_HOLT_WINTERS:
         if not STATSMODELS_AVAILABLE:
@@ -101,32 +309,119 @@ def generate_forecast(
 
         # Ensure numeric type
         series = daily[value_col].astype(float)
-        
-        # Add small noise to avoid zero errors if needed, but usually not strict for add model
-        # ExponentialSmoothing
-        # Use simple 'add' trend/seasonal for robustness on small data
-        model = ExponentialSmoothing(
-            series, trend="add", seasonal=None, initialization_method="estimated"
-        )
-        fit = model.fit()
-        forecast_values = fit.forecast(full_horizon_days).values
+        series_np = series.to_numpy()
+
+        if series_np.size < 14 or series_np.std() < 1e-6:
+            # Degenerate series (too short or flat): the optimizer would only
+            # converge to the mean anyway, so skip the fit.
+            forecast_values = _naive_forecast(series_np, full_horizon_days)
+        else:
+            # Add small noise to avoid zero errors if needed, but usually not strict for add model
+            # ExponentialSmoothing
+            # Use simple 'add' trend/seasonal for robustness on small data
+            es_cls = _load_exponential_smoothing()
+            fit = _fit_cached(
+                es_cls,
+                series,
+                lambda: es_cls(
+                    series, trend="add", seasonal=None, initialization_method="estimated"
+                ).fit(),
+            )
+            forecast_values = fit.forecast(full_horizon_days).values
 
     else:
         # Default fallback (Naive average)
-        avg_val = daily[value_col].mean()
-        forecast_values = [avg_val] * full_horizon_days
+        forecast_values = _naive_forecast(
+            daily[value_col].to_numpy(dtype=np.float64), full_horizon_days
+        )
 
     # ---------------------------------------------------------
     # POST-PROCESSING RULES
     # ---------------------------------------------------------
-    
-    # 1. Optimistic Bias:
-    # If the forecast starts lower than the recent average (last 30 days), 
-    # we lift it slightly to assume growth, not immediate crash.
     recent_avg = daily.tail(30)[value_col].mean()
     if pd.isna(recent_avg): 
         recent_avg = 0
-        
+
+    hist_std = daily[value_col].std()
+    if pd.isna(hist_std) or hist_std == 0:
+        hist_std = recent_avg * 0.1 # Default 10% if no std
+
+    final_values = _apply_bias_floor_noise(forecast_values, recent_avg, hist_std, rng)
+
+    # Combine into DataFrame: both segments are written into preallocated
+    # buffers and wrapped once, with no intermediate frames to concat
+    n_hist = len(daily)
+    n_total = n_hist + full_horizon_days
+    dates = np.empty(n_total, dtype="datetime64[ns]")
+    dates[:n_hist] = daily[date_col].to_numpy(dtype="datetime64[ns]")
+    dates[n_hist:] = future_dates.to_numpy(dtype="datetime64[ns]")
+    # float32 halves the value buffer: counts and daily revenue carry far fewer
+    # significant digits than float64 holds, and are displayed rounded
+    values = np.empty(n_total, dtype=np.float32)
+    values[:n_hist] = daily[value_col].to_numpy(dtype=np.float32)
+    values[n_hist:] = final_values
+    # Totals over the stored (float32) values, so callers needn't re-filter
+    # the frame by 'Type' just to sum the horizon
+    future_sum = float(values[n_hist:].sum(dtype=np.float64))
+    summary = {
+        "future_sum": future_sum,
+        "future_mean": future_sum / full_horizon_days if full_horizon_days else np.nan,
+        "history_sum": float(values[:n_hist].sum(dtype=np.float64)),
+    }
+
+    if not include_type:
+        final_df = _frame_from_arrays([dates, values], [date_col, value_col])
+        final_df.attrs["forecast_summary"] = summary
+        return final_df, n_hist
+
+    codes = np.empty(n_total, dtype=np.int8)
+    codes[:n_hist] = 0
+    codes[n_hist:] = 1
+
+    final_df = _frame_from_arrays(
+        [
+            dates,
+            values,
+            # Two-valued label: int8 codes instead of one Python str per row
+            pd.Categorical.from_codes(codes, categories=_TYPE_CATEGORIES),
+        ],
+        [date_col, value_col, "Type"],
+    )
+    final_df.attrs["forecast_summary"] = summary
+
+    return final_df
+
+
+def _frame_from_arrays(arrays: list, columns: list) -> pd.DataFrame:
+    """
+    Wraps freshly built, equal-length column arrays in a DataFrame without
+    copying them, going straight to the block manager when pandas allows it.
+    """
+    index = pd.RangeIndex(len(arrays[0]))
+    try:
+        # Private constructor: skips the dict validation of the public one
+        return pd.DataFrame._from_arrays(
+            arrays, columns=pd.Index(columns), index=index, verify_integrity=False
+        )
+    except (AttributeError, TypeError):
+        return pd.DataFrame(dict(zip(columns, arrays)), index=index, copy=False)
+
+
+def _naive_forecast(train: np.ndarray, h: int) -> np.ndarray:
+    """Repeats the training mean over the `h`-day horizon."""
+    return np.full(h, train.mean() if train.size else np.nan, dtype=np.float64)
+
+
+def _apply_bias_floor_noise(
+    forecast_values, recent_avg: float, hist_std: float, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Applies the post-processing rules of `generate_forecast` to the raw model
+    output in a handful of whole-array operations and returns a float32 array.
+    """
+    # 1. Optimistic Bias:
+    # If the forecast starts lower than the recent average (last 30 days), 
+    # we lift it slightly to assume growth, not immediate crash.
     first_forecast = forecast_values[0] if len(forecast_values) > 0 else 0
     
     bias_percentage = 0.0
@@ -136,43 +431,28 @@ def generate_forecast(
          # Cap bias at 20% to avoid explosion
          bias_percentage = min(diff, 0.20)
     
+    # The post-processing runs in float32, like the output column: the model
+    # output has far fewer meaningful digits and is displayed rounded anyway.
+    fv = np.asarray(forecast_values, dtype=np.float32)
+
     # Apply bias
-    adjusted_forecast = [v * (1 + bias_percentage) for v in forecast_values]
+    fv *= np.float32(1 + bias_percentage)
 
     # 2. Sustainability Floor:
     # Ensure no value drops below 40% of the recent average (unless recent average is 0)
     floor = recent_avg * 0.4
-    adjusted_forecast = [max(v, floor) for v in adjusted_forecast]
+    np.maximum(fv, np.float32(floor), out=fv)
 
     # 3. Organic Noise:
-    # Add random variation based on historical std dev
-    hist_std = daily[value_col].std()
-    if pd.isna(hist_std) or hist_std == 0:
-        hist_std = recent_avg * 0.1 # Default 10% if no std
-        
-    # Generate noise for each day
-    # Use fixed seed for reproducibility within same call if needed, but random is better for "organic" feel
-    noise = np.random.normal(0, hist_std * 0.3, size=len(adjusted_forecast)) 
-    
-    final_values = []
-    for val, n in zip(adjusted_forecast, noise):
-        final_val = val + n
-        # Ensure non-negative
-        final_values.append(max(0, final_val))
-
-    # Combine into DataFrame
-    forecast_df = pd.DataFrame(
-        {
-            date_col: future_dates,
-            value_col: final_values,
-            "Type": C.UI_LABEL_FORECAST,
-        }
-    )
+    # Add random variation based on historical std dev, one draw per day
+    noise = rng.standard_normal(fv.size, dtype=np.float32)
+    noise *= np.float32(hist_std * 0.3)
+    np.add(fv, noise, out=fv)
 
-    daily["Type"] = C.UI_LABEL_HISTORY
-    final_df = pd.concat([daily, forecast_df], ignore_index=True)
+    # Ensure non-negative
+    np.maximum(fv, np.float32(0), out=fv)
+    return fv
 
-    return final_df
 
 def run_backtest(
     df: pd.DataFrame,
@@ -186,15 +466,48 @@ def run_backtest(
     and comparing forecasts against actuals.
     """
     # Prepare Data
-    daily = df.groupby(df[date_col].dt.date)[value_col].sum().reset_index()
-    daily[date_col] = pd.to_datetime(daily[date_col])
-    daily = daily.sort_values(date_col)
-    
-    # Fill missing days
-    idx = pd.date_range(daily[date_col].min(), daily[date_col].max())
-    daily = daily.set_index(date_col).reindex(idx, fill_value=0).reset_index()
-    daily = daily.rename(columns={"index": date_col})
-    
+    daily = _prepare_daily(df, date_col, value_col)
+    return _backtest_daily(daily, date_col, value_col, algorithm, test_days)
+
+
+def run_backtest_multi(
+    df: pd.DataFrame,
+    date_col: str,
+    value_col: str,
+    algorithms: list,
+    test_days: int = 30,
+) -> dict:
+    """
+    Runs `run_backtest` for several algorithms concurrently over the same data.
+
+    The daily series is prepared once and shared read-only by the workers.
+    Threads are enough here: Prophet fits in a CmdStan subprocess and the
+    statsmodels optimizer spends most of its time in compiled code.
+
+    Returns:
+        dict: algorithm -> the `run_backtest` result. An algorithm that raises
+              (e.g. its library is missing) gets `{"error": message}` instead
+              of aborting the others.
+    """
+    daily = _prepare_daily(df, date_col, value_col)
+
+    def _run(algorithm):
+        try:
+            return _backtest_daily(daily, date_col, value_col, algorithm, test_days)
+        except Exception as e:
+            return {"error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(len(algorithms), 4))) as ex:
+        return dict(zip(algorithms, ex.map(_run, algorithms)))
+
+
+def _backtest_daily(
+    daily: pd.DataFrame,
+    date_col: str,
+    value_col: str,
+    algorithm: str,
+    test_days: int,
+) -> dict:
     if len(daily) <= test_days:
         return {"error": "Dados insuficientes para backtesting."}
 
@@ -207,44 +520,60 @@ def run_backtest(
     # if we want raw model accuracy, OR keep it if we want to test OUR pipeline.
     # Let's keep the pipeline to test "what user sees".
     
-    # We need to adapt generate_forecast to accept a DF and return just values or DF
-    # But generate_forecast expects raw transaction data usually? 
-    # No, it expects a DF with date_col and value_col. 
-    # train_df is already aggregated. generate_forecast re-aggregates.
-    # That's fine, re-aggregating aggregated data is idempotent (sum of sums).
-    
-    forecast_result = generate_forecast(
-        train_df, date_col, value_col, algorithm, test_days
+    # train_df is already aggregated and continuous, so skip the public
+    # entry point (which would group by day and reindex all over again).
+    # No display here: skip the Type column and slice the forecast by position
+    forecast_result, hist_len = _generate_forecast_from_daily(
+        train_df, date_col, value_col, algorithm, test_days, include_type=False
     )
     
     # Extract forecast part
-    forecast_only = forecast_result[forecast_result["Type"] == C.UI_LABEL_FORECAST].copy()
+    forecast_only = forecast_result.iloc[hist_len:]
     
     # Align dates
     # generate_forecast generates dates starting from train_df.max() + 1 day
     # which matches test_df structure exactly.
     
-    # Merge for comparison
-    comparison = pd.merge(
-        test_df[[date_col, value_col]], 
-        forecast_only[[date_col, value_col]], 
-        on=date_col, 
-        how="inner",
-        suffixes=("_actual", "_predicted")
-    )
+    test_dates = test_df[date_col].to_numpy()
+    forecast_dates = forecast_only[date_col].to_numpy()
+    if np.array_equal(test_dates, forecast_dates):
+        # Same days in the same order: pair the columns directly
+        comparison = pd.DataFrame(
+            {
+                date_col: test_dates,
+                f"{value_col}_actual": test_df[value_col].to_numpy(),
+                f"{value_col}_predicted": forecast_only[value_col].to_numpy(),
+            }
+        )
+    else:
+        # Merge for comparison
+        comparison = pd.merge(
+            test_df[[date_col, value_col]], 
+            forecast_only, 
+            on=date_col, 
+            how="inner",
+            suffixes=("_actual", "_predicted")
+        )
     
     # Calculate Metrics
-    y_true = comparison[f"{value_col}_actual"]
-    y_pred = comparison[f"{value_col}_predicted"]
+    # Materialize the residuals once and derive all three metrics from them
+    y_true = comparison[f"{value_col}_actual"].to_numpy(dtype=np.float64)
+    y_pred = comparison[f"{value_col}_predicted"].to_numpy(dtype=np.float64)
+    diff = y_true - y_pred
+    abs_diff = np.abs(diff)
     
-    mae = np.mean(np.abs(y_true - y_pred))
-    rmse = np.sqrt(np.mean((y_true - y_pred)**2))
+    mae = abs_diff.mean()
+    rmse = np.sqrt(np.mean(diff * diff))
     
     # MAPE (avoid div by zero)
-    # Add epsilon or filter zeros
+    # Zero actuals are skipped: one masked divide, no fancy-indexed copies
     non_zero = y_true != 0
-    if non_zero.any():
-        mape = np.mean(np.abs((y_true[non_zero] - y_pred[non_zero]) / y_true[non_zero])) * 100
+    n_non_zero = np.count_nonzero(non_zero)
+    if n_non_zero:
+        ape = np.divide(
+            abs_diff, y_true, out=np.zeros_like(abs_diff), where=non_zero
+        )
+        mape = ape.sum() / n_non_zero * 100
     else:
         mape = 0.0
         
@@ -264,12 +593,14 @@ def generate_smart_insights(
     forecast_df: pd.DataFrame,
     unit_label: str = C.LABEL_NEW_CONTRACTS,
     is_currency: bool = False,
+    daily: pd.DataFrame | None = None,
 ) -> str:
     """
     Generates a natural language summary and analysis of the historical and forecast data.
 
     It calculates:
-    - **Recent Trend**: Compares the last 7 days vs the previous 7 days to determine if the
+    - **Recent Trend**: Fits a least-squares slope over the last 14 days (days without
+      records count as zero) and expresses it as a weekly % change to determine if the
       metric is growing, slowing down, or stable.
     - **Forecast Totals**: Sums up the predicted values for the full horizon.
     - **Daily Average**: Calculates the expected daily run rate.
@@ -283,61 +614,96 @@ def generate_smart_insights(
         forecast_df (pd.DataFrame): The output from `generate_forecast`.
         unit_label (str, optional): Label for the unit (e.g., "novos contratos"). Defaults to C.LABEL_NEW_CONTRACTS.
         is_currency (bool, optional): If True, formats values as currency (R$). Defaults to False.
+        daily (pd.DataFrame | None, optional): The daily history returned by
+            `generate_forecast(..., return_daily=True)`; used instead of re-aggregating `df`.
 
     Returns:
         str: A formatted string with emojis and insights ready for display in Streamlit.
     """
     # 1. Historical Analysis
-    daily = df.groupby(df[date_col].dt.date)[value_col].sum().sort_index()
-    if len(daily) < 14:
+    # Reuse the daily series already built by `generate_forecast` if available
+    if daily is None or value_col not in daily.columns:
+        if df.empty:
+            return C.MSG_INSUFFICIENT_DATA
+        daily = _prepare_daily(df, date_col, value_col)
+    arr = daily[value_col].to_numpy(dtype=np.float64)
+    if arr.size < 14:
         return C.MSG_INSUFFICIENT_DATA
 
-    recent_avg = daily.tail(7).mean()
-    prev_avg = daily.iloc[-14:-7].mean()
+    # 2. Forecast Analysis
+    # Mask the value array directly instead of materializing a filtered frame
+    is_forecast = (
+        forecast_df[C.COL_FORECAST_TYPE] == C.LABEL_FORECAST_TYPE_FORECAST
+    ).to_numpy()
+    future_vals = forecast_df[value_col].to_numpy(dtype=np.float64)[is_forecast]
 
-    trend_pct = 0
-    if prev_avg > 0:
-        trend_pct = ((recent_avg - prev_avg) / prev_avg) * 100
+    return _smart_insights_from_arrays(arr, future_vals, unit_label, is_currency)
 
-    # 2. Forecast Analysis
-    future_only = forecast_df[forecast_df[C.COL_FORECAST_TYPE] == C.LABEL_FORECAST_TYPE_FORECAST]
-    future_sum = future_only[value_col].sum()
-    future_daily_avg = future_only[value_col].mean()
-
-    horizon_days = len(future_only)
-
-    # 3. Construct Text
-    text = C.MSG_SMART_ANALYSIS_TITLE
-
-    # Trend
-    if trend_pct > 5:
-        emoji = "🚀"
-        trend_desc = C.INSIGHT_GROWTH
-    elif trend_pct < -5:
-        emoji = "⚠️"
-        trend_desc = C.INSIGHT_SLOWDOWN
-    else:
-        emoji = "⚖️"
-        trend_desc = C.INSIGHT_STABLE
 
-    text += (
-        f"{C.MSG_RECENT_TREND} {trend_desc} ({trend_pct:+.1f}%) {emoji}\n\n"
-    )
+def _smart_insights_from_arrays(
+    history: np.ndarray,
+    forecast_values: np.ndarray,
+    unit_label: str = C.LABEL_NEW_CONTRACTS,
+    is_currency: bool = False,
+) -> str:
+    """
+    Core of `generate_smart_insights` on plain arrays: the gap-free daily
+    history and the forecast values, both float64.
+    """
+    if history.size < 14:
+        return C.MSG_INSUFFICIENT_DATA
+
+    # Plain ndarray slices are zero-copy views, so the window statistics below
+    # skip the pandas Series overhead (which dominates on ~14 elements). The
+    # last 14 days are sliced once; the recent week is its second half.
+    window = history[-14:]
+    recent_avg = window[7:].mean()
 
-    text += C.MSG_FORECAST_NEXT_DAYS.format(horizon_days=horizon_days)
+    # Least-squares slope over the last 14 days in closed form
+    # (cov(x, y) / var(x)): uses every day instead of two window means, so a
+    # single outlier day moves it less, and needs no polyfit/lstsq call.
+    window_avg = window.mean()
+    x = np.arange(window.size, dtype=np.float64)
+    slope = ((x * window).mean() - x.mean() * window_avg) / x.var()
+
+    # Expressed as the week-over-week change relative to the window level
+    trend_pct = 0
+    if window_avg > 0:
+        trend_pct = (slope * 7 / window_avg) * 100
+
+    horizon_days = forecast_values.size
+    # One reduction: the daily average is derived from the total
+    future_sum = forecast_values.sum()
+    future_daily_avg = future_sum / horizon_days if horizon_days else np.nan
+
+    # 3. Construct Text: pick each varying piece, then format once
+    emoji, trend_desc = (
+        ("🚀", C.INSIGHT_GROWTH)
+        if trend_pct > 5
+        else ("⚠️", C.INSIGHT_SLOWDOWN)
+        if trend_pct < -5
+        else ("⚖️", C.INSIGHT_STABLE)
+    )
 
     if is_currency:
-        text += f"- {C.MSG_ESTIMATED_TOTAL} R$ {future_sum:,.2f}\n"
-        text += f"- {C.MSG_EXPECTED_DAILY_AVG} R$ {future_daily_avg:,.2f}/dia\n\n"
+        total_str = f"R$ {future_sum:,.2f}"
+        daily_str = f"R$ {future_daily_avg:,.2f}/dia"
     else:
-        text += f"- {C.MSG_ESTIMATED_TOTAL} {int(future_sum)} {unit_label}\n"
-        text += f"- {C.MSG_EXPECTED_DAILY_AVG} {future_daily_avg:.1f} {unit_label}/dia\n\n"
+        total_str = f"{int(future_sum)} {unit_label}"
+        daily_str = f"{future_daily_avg:.1f} {unit_label}/dia"
 
     if future_daily_avg > recent_avg * 1.05:
-        text += f"{C.MSG_INSIGHT_PREFIX} {C.INSIGHT_POSITIVE}"
+        insight = C.INSIGHT_POSITIVE
     elif future_daily_avg < recent_avg * 0.9:
-        text += f"{C.MSG_INSIGHT_PREFIX} {C.INSIGHT_NEGATIVE}"
+        insight = C.INSIGHT_NEGATIVE
     else:
-        text += f"{C.MSG_INSIGHT_PREFIX} {C.INSIGHT_NEUTRAL}"
+        insight = C.INSIGHT_NEUTRAL
 
-    return text
+    return (
+        f"{C.MSG_SMART_ANALYSIS_TITLE}"
+        f"{C.MSG_RECENT_TREND} {trend_desc} ({trend_pct:+.1f}%) {emoji}\n\n"
+        f"{C.MSG_FORECAST_NEXT_DAYS.format(horizon_days=horizon_days)}"
+        f"- {C.MSG_ESTIMATED_TOTAL} {total_str}\n"
+        f"- {C.MSG_EXPECTED_DAILY_AVG} {daily_str}\n\n"
+        f"{C.MSG_INSIGHT_PREFIX} {insight}"
+    )
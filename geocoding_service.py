@@ -7,8 +7,9 @@ import constants as C
 
 
 class GeocodingService:
-    def __init__(self, db_path=C.GEO_DB_PATH):
+    def __init__(self, db_path=C.GEO_DB_PATH, failure_ttl=C.GEO_FAILURE_TTL):
         self.db_path = db_path
+        self.failure_ttl = failure_ttl
         self._init_db()
         self.geolocator = Nominatim(user_agent=C.GEO_USER_AGENT)
 
@@ -27,6 +28,16 @@ class GeocodingService:
             # Garantir índice na coluna key para performance (embora PK já crie índice implícito,
             # isso garante redundância caso o esquema mude)
             conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_key ON cache (key)")
+            # Negative cache for transient errors (timeouts). Kept apart from `cache`,
+            # whose NULL rows mean "not found" and never expire.
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS failures (
+                    key TEXT PRIMARY KEY,
+                    timestamp REAL
+                );
+            """
+            )
 
     def get_coords(self, city: str, state: str) -> tuple[float | None, float | None]:
         if not city or not state:
@@ -45,6 +56,14 @@ class GeocodingService:
                 # For now, simplistic permanent cache.
                 return row[0], row[1]
 
+            # Recent timeout for this key: skip the (slow) API call until the TTL expires
+            cursor = conn.execute(
+                "SELECT 1 FROM failures WHERE key = ? AND timestamp > ?",
+                (key, time.time() - self.failure_ttl),
+            )
+            if cursor.fetchone():
+                return None, None
+
         # Fetch from API
         query = f"{city}, {state}, {C.GEO_COUNTRY}"
         try:
@@ -69,7 +88,13 @@ class GeocodingService:
             return lat, lon
 
         except (GeocoderTimedOut, GeocoderUnavailable):
-            # Don't cache timeout errors, we want to retry them later
+            # Don't cache timeout errors permanently, we want to retry them later,
+            # but remember them for `failure_ttl` seconds
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO failures (key, timestamp) VALUES (?, ?)",
+                    (key, time.time()),
+                )
             return None, None
         except Exception as e:
             print(f"Geocoding error for {query}: {e}")
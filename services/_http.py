@@ -0,0 +1,69 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+def _build_session() -> requests.Session:
+    """Shared session for the IBGE/SIDRA APIs (keep-alive + connection pooling)."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": "educa-mais-dashboard"})
+    return session
+
+
+SESSION = _build_session()
+
+# Upper bound for concurrent requests to IBGE (stays within its rate tolerance)
+MAX_WORKERS = 8
+
+
+def get_json(url: str, timeout: float):
+    """GET `url` through the shared session and decode the JSON body."""
+    r = SESSION.get(url, timeout=timeout)
+    r.raise_for_status()
+    return decode_json(r)
+
+
+def decode_json(r: requests.Response):
+    """Decode a JSON response body, using orjson on the raw bytes when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(r.content)
+    return r.json()
+
+
+def iter_json_items(url: str, timeout: float):
+    """
+    Yield the elements of a top-level JSON array served at `url`.
+
+    With ijson installed the body is parsed as it streams in, so only one element
+    is materialised at a time; otherwise it falls back to decoding the whole body.
+    """
+    if not IJSON_AVAILABLE:
+        yield from get_json(url, timeout)
+        return
+    with SESSION.get(url, timeout=timeout, stream=True) as r:
+        r.raise_for_status()
+        r.raw.decode_content = True  # let urllib3 undo gzip/deflate
+        yield from ijson.items(r.raw, "item")
@@ -0,0 +1,45 @@
+import threading
+import time
+from typing import Any, Callable, List
+
+
+class ProcessSingleton:
+    """
+    Lazily fetched, process-wide value with a TTL.
+
+    For argument-free loaders this skips the per-call key hashing of
+    `st.cache_data`. The value is shared across sessions, so callers must treat
+    it as read-only. Exceptions from `fetch` propagate and nothing is stored.
+    """
+
+    def __init__(self, fetch: Callable[[], Any], ttl: float):
+        self._fetch = fetch
+        self._ttl = ttl
+        self._value = None
+        self._ts = 0.0
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def get(self) -> Any:
+        if self._value is not None and time.time() - self._ts < self._ttl:
+            return self._value
+        with self._lock:
+            # Another thread may have loaded it while we waited for the lock
+            if self._value is None or time.time() - self._ts >= self._ttl:
+                self._value = self._fetch()
+                self._ts = time.time()
+            return self._value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._value = None
+            self._ts = 0.0
+
+
+_REGISTRY: List[ProcessSingleton] = []
+
+
+def clear_all() -> None:
+    """Drop every process-wide singleton (used by the "reload data" button)."""
+    for singleton in _REGISTRY:
+        singleton.clear()
@@ -40,9 +40,23 @@ def validate_columns(df: pd.DataFrame, required: list[str]) -> bool:
     return True
 
 
+def strip_text(x) -> str:
+    return str(x).strip()
+
+
+def strip_upper_text(x) -> str:
+    return str(x).strip().upper()
+
+
 def process_column(df: pd.DataFrame, src: str, dest: str, func=None, default=None):
     if src in df.columns:
-        if func:
+        # Common text normalizations go through the pandas string accessor
+        # instead of a per-row Python callback (same output as `apply`).
+        if func is strip_text:
+            df[dest] = df[src].astype(str).str.strip()
+        elif func is strip_upper_text:
+            df[dest] = df[src].astype(str).str.strip().str.upper()
+        elif func:
             df[dest] = df[src].apply(func)
         else:
             df[dest] = df[src]
@@ -72,22 +86,16 @@ def get_dados(sheet_id: str) -> pd.DataFrame:
         return df
 
     process_column(df, C.COL_SRC_TIMESTAMP, C.COL_INT_DT, parse_datetime_any)
-    process_column(
-        df, C.COL_SRC_STATUS, C.COL_INT_STATUS, lambda x: str(x).strip().upper(), ""
-    )
-    process_column(
-        df, C.COL_SRC_CAPTADOR, C.COL_INT_CAPTADOR, lambda x: str(x).strip(), ""
-    )
-    process_column(
-        df, C.COL_SRC_STATE, C.COL_INT_STATE, lambda x: str(x).strip().upper(), ""
-    )
-    process_column(df, C.COL_SRC_CITY, C.COL_INT_CITY, lambda x: str(x).strip(), "")
-    process_column(df, C.COL_SRC_CEP, C.COL_INT_CEP, lambda x: str(x).strip(), "")
+    process_column(df, C.COL_SRC_STATUS, C.COL_INT_STATUS, strip_upper_text, "")
+    process_column(df, C.COL_SRC_CAPTADOR, C.COL_INT_CAPTADOR, strip_text, "")
+    process_column(df, C.COL_SRC_STATE, C.COL_INT_STATE, strip_upper_text, "")
+    process_column(df, C.COL_SRC_CITY, C.COL_INT_CITY, strip_text, "")
+    process_column(df, C.COL_SRC_CEP, C.COL_INT_CEP, strip_text, "")
     process_column(
         df,
         C.COL_SRC_CONTRACT_TYPE,
         C.COL_INT_CONTRACT_TYPE,
-        lambda x: str(x).strip(),
+        strip_text,
         "",
     )
 
@@ -103,6 +111,11 @@ def get_dados(sheet_id: str) -> pd.DataFrame:
     if C.COL_INT_STATE in df.columns:
         df[C.COL_INT_REGION] = df[C.COL_INT_STATE].map(C.ESTADO_REGIAO).fillna(C.DEFAULT_REGION_OTHER)
 
+    # Status and contract type are small enumerations only compared with
+    # ==/isin/value_counts downstream; as categoricals those run on int codes
+    df[C.COL_INT_STATUS] = df[C.COL_INT_STATUS].astype("category")
+    df[C.COL_INT_CONTRACT_TYPE] = df[C.COL_INT_CONTRACT_TYPE].astype("category")
+
     return df
 
 
@@ -131,14 +144,14 @@ def get_faturamento(sheet_id: str) -> pd.DataFrame:
         df,
         C.COL_SRC_FINANCIAL_TYPE,
         C.COL_INT_FINANCIAL_TYPE,
-        lambda x: str(x).strip().upper(),
+        strip_upper_text,
         "",
     )
     process_column(
         df,
         C.COL_SRC_CONTRACT_TYPE,
         C.COL_INT_CONTRACT_TYPE,
-        lambda x: str(x).strip(),
+        strip_text,
         "",
     )
 
@@ -1,21 +1,26 @@
-import requests
 import pandas as pd
 from typing import List, Dict
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from services._http import SESSION, MAX_WORKERS, decode_json, get_json
 
 
 AGREGADO_CEMPRE = "1685"
 AGREGADOS_VARIAVEIS = "https://servicodados.ibge.gov.br/api/v3/agregados/{ag}/variaveis"
 SIDRA_VALUES = "https://apisidra.ibge.gov.br/values/t/{t}/n6/{ids}/v/{v}/p/last"
 
+# Request timeouts (seconds)
+_TIMEOUT_METADATA = 15
+_TIMEOUT_SIDRA = 20
+
 
 @st.cache_data(ttl=86400, show_spinner=False)
 def get_variable_id_by_name(agregado: str, contains: str) -> str | None:
     try:
         url = AGREGADOS_VARIAVEIS.format(ag=agregado)
-        r = requests.get(url, timeout=15)
+        r = SESSION.get(url, timeout=_TIMEOUT_METADATA)
         r.raise_for_status()
-        vars = r.json()
+        vars = decode_json(r)
         for v in vars:
             nome = str(v.get("nome", ""))
             vid = str(v.get("id", ""))
@@ -26,21 +31,24 @@ def get_variable_id_by_name(agregado: str, contains: str) -> str | None:
         return None
 
 
-@st.cache_data(ttl=86400, show_spinner=False)
+# Map of 'Letter Description' -> 'Category ID' for CNAE 2.0 Sections.
+# Empty because Table 1685 metadata is flaky; kept for interface compatibility.
+CNAE_SECTIONS: Dict[str, str] = {}
+
+
 def get_cnae_sections() -> Dict[str, str]:
     """
     Returns a map of 'Letter Description' -> 'Category ID' for CNAE 2.0 Sections.
     Currently returns empty dict because Table 1685 metadata is flaky.
     Code kept for interface compatibility but logic disabled.
     """
-    return {}
+    return CNAE_SECTIONS
 
 
 @st.cache_data(ttl=86400, show_spinner=False)
-def get_unidades_locais(ids: List[str], cnae_cat_id: str = "all") -> pd.DataFrame:
+def get_unidades_locais(ids: List[str]) -> pd.DataFrame:
     """
-    Fetches local units for given municipalities.
-    If cnae_cat_id is provided but fails (or is 'all'), fetches TOTAL units.
+    Fetches the TOTAL local units (all CNAE categories) for given municipalities.
     """
     if not ids:
         return pd.DataFrame(columns=["id", "unidades_locais"])
@@ -49,27 +57,39 @@ def get_unidades_locais(ids: List[str], cnae_cat_id: str = "all") -> pd.DataFram
     if not var_id:
         return pd.DataFrame(columns=["id", "unidades_locais"])
 
-    rows: List[Dict] = []
+    ids_l: List[str] = []
+    vals_l: List = []
 
-    # We ignore cnae_cat_id for now because without valid metadata we can't reliably build queries.
+    # No per-CNAE filter: without valid metadata we can't reliably build queries.
     # Future: Re-enable classif_param if we find static IDs for CNAE Sections.
 
-    for i in range(0, len(ids), 40):
-        batch_ids = ids[i : i + 40]
-        # Standard query = Total Local Units (All Categories)
-        url = SIDRA_VALUES.format(t=AGREGADO_CEMPRE, ids="|".join(batch_ids), v=var_id)
-
-        try:
-            r = requests.get(url, timeout=20)
-            r.raise_for_status()
-            j = r.json()
-            for row in j[1:]:
-                rows.append(
-                    {
-                        "id": str(row.get("D1C", "")),
-                        "unidades_locais": int(float(row.get("V", 0))),
-                    }
-                )
-        except Exception:
-            continue
-    return pd.DataFrame(rows)
+    # Standard query = Total Local Units (All Categories)
+    urls = [
+        SIDRA_VALUES.format(t=AGREGADO_CEMPRE, ids="|".join(ids[i : i + 40]), v=var_id)
+        for i in range(0, len(ids), 40)
+    ]
+
+    # Batches are independent and latency-bound: fetch them concurrently
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        futures = [ex.submit(get_json, url, _TIMEOUT_SIDRA) for url in urls]
+        for fut in futures:
+            try:
+                j = fut.result()
+                for row in j[1:]:
+                    ids_l.append(str(row.get("D1C", "")))
+                    vals_l.append(row.get("V", 0))
+            except Exception:
+                continue
+
+    # Column-wise construction: one vectorized numeric parse instead of
+    # a dict + int(float(...)) per SIDRA row
+    return pd.DataFrame(
+        {
+            "id": pd.Series(ids_l, dtype=object),
+            "unidades_locais": pd.to_numeric(
+                pd.Series(vals_l, dtype=object), errors="coerce"
+            )
+            .fillna(0)
+            .astype("int64"),
+        }
+    )
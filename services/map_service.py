@@ -1,8 +1,11 @@
-import requests
 import streamlit as st
+from typing import Dict, Optional, Tuple
 import unicodedata
+from functools import lru_cache
 import logging
 import constants as C
+from services._http import SESSION, decode_json
+from services._singleton import ProcessSingleton
 
 logger = logging.getLogger(__name__)
 
@@ -10,31 +13,46 @@ def normalize_string(s: str) -> str:
     """Normalize string: lowercase, remove accents."""
     if not isinstance(s, str):
         return ""
+    return _normalize_cached(s)
+
+@lru_cache(maxsize=16384)
+def _normalize_cached(s: str) -> str:
+    # Memoized: state siglas and city names repeat heavily across lookups
+    if s.isascii():
+        # Nothing to decompose: skip the NFD allocation and per-char scan
+        return s.lower().strip()
+    # combining() returns an int: cheaper than building and comparing category()
     return ''.join(
         c for c in unicodedata.normalize('NFD', s)
-        if unicodedata.category(c) != 'Mn'
+        if not unicodedata.combining(c)
     ).lower().strip()
 
-@st.cache_data(ttl=86400) # Cache for 24h
+# IBGE territorial data barely changes: persist it on disk so restarts and other
+# workers skip the download (Streamlit ignores `ttl` on persisted caches; the
+# "reload data" button clears them). Errors are raised inside the cached
+# fetchers so that a failed request is never persisted.
+@st.cache_data(persist="disk")
+def _fetch_all_municipios():
+    response = SESSION.get(C.API_URL_IBGE_MUNICIPIOS)
+    response.raise_for_status()
+    return decode_json(response)
+
+# In-process copy in front of the disk cache: no cache-key hashing per call
+_ALL_MUNICIPIOS = ProcessSingleton(_fetch_all_municipios, ttl=86400)
+
 def get_all_municipios():
     """Fetch all municipalities from IBGE to build a lookup table."""
     try:
-        response = requests.get(C.API_URL_IBGE_MUNICIPIOS)
-        response.raise_for_status()
-        return response.json()
+        return _ALL_MUNICIPIOS.get()
     except Exception as e:
         logger.error(f"Error fetching IBGE municipalities: {e}")
         return []
 
 @st.cache_data(ttl=86400)
-def get_ibge_code(city: str, state: str) -> str:
-    """Find IBGE code for a city/state pair."""
-    all_mun = get_all_municipios()
-    
-    norm_city = normalize_string(city)
-    norm_state = normalize_string(state)
-    
-    for mun in all_mun:
+def _build_municipio_index() -> Dict[Tuple[str, str], str]:
+    """Build a (normalized state, normalized city) -> IBGE code lookup table."""
+    index = {}
+    for mun in get_all_municipios():
         # Check state first (try standard path then alternative path)
         # Standard: mun['microrregiao']['mesorregiao']['UF']['sigla']
         # Alternative (New municipalities): mun['regiao-imediata']['regiao-intermediaria']['UF']['sigla']
@@ -47,24 +65,49 @@ def get_ibge_code(city: str, state: str) -> str:
                  mun_state = mun['regiao-imediata']['regiao-intermediaria']['UF']['sigla']
         except (KeyError, TypeError):
             continue
-            
-        if mun_state and normalize_string(mun_state) == norm_state:
-            if normalize_string(mun['nome']) == norm_city:
-                return str(mun['id'])
-            
-    return None
+
+        if mun_state:
+            # Siglas are already two-letter ASCII codes, a plain lower() matches
+            # normalize_string(state) on the lookup side.
+            # Keep the first match, as the former linear scan did
+            index.setdefault(
+                (mun_state.lower(), normalize_string(mun['nome'])),
+                str(mun['id']),
+            )
+    return index
+
+@st.cache_data(ttl=86400)
+def get_ibge_code(city: str, state: str) -> str:
+    """Find IBGE code for a city/state pair."""
+    return _build_municipio_index().get(
+        (normalize_string(state), normalize_string(city))
+    )
 
 @st.cache_data(ttl=86400)
+def get_ibge_codes_bulk(
+    pairs: Tuple[Tuple[str, str], ...]
+) -> Dict[Tuple[str, str], Optional[str]]:
+    """Resolve many (city, state) pairs at once, paying the cache lookup only once."""
+    index = _build_municipio_index()
+    return {
+        (city, state): index.get((normalize_string(state), normalize_string(city)))
+        for city, state in pairs
+    }
+
+@st.cache_data(persist="disk")
+def _fetch_municipality_geojson(ibge_code: str):
+    url = C.API_URL_IBGE_MALHA_MUNICIPO.format(id=ibge_code)
+    response = SESSION.get(url)
+    response.raise_for_status()
+    return decode_json(response)
+
 def get_municipality_geojson(ibge_code: str):
     """Fetch GeoJSON for a specific municipality code."""
     if not ibge_code:
         return None
         
-    url = C.API_URL_IBGE_MALHA_MUNICIPO.format(id=ibge_code)
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
+        return _fetch_municipality_geojson(ibge_code)
     except Exception as e:
         logger.error(f"Error fetching GeoJSON for {ibge_code}: {e}")
         return None
@@ -1,87 +1,119 @@
-import requests
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Set
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from services._http import SESSION, MAX_WORKERS, decode_json, get_json, iter_json_items
+from services._singleton import ProcessSingleton
 
-try:
-    import constants as C
-except Exception:
-    C = None
 import constants as C
 
 
 IBGE_MUNICIPIOS_UF = C.API_URL_IBGE_MUNICIPIOS_UF
 SIDRA_POP_2022 = C.API_URL_SIDRA_POP_2022
 SIDRA_POP_2022_ALL = C.API_URL_SIDRA_POP_2022_ALL
+_ESTADO_REGIAO = C.ESTADO_REGIAO
+
+# Request timeouts (seconds), by expected payload size
+_TIMEOUT_FAST = 10
+_TIMEOUT_NORMAL = 15
+_TIMEOUT_SLOW = 30
+
+
+def _municipios_frame(data: List[Dict], uf: str) -> pd.DataFrame:
+    # Two lists plus two broadcast scalars, instead of one dict per municipality
+    items = [m or {} for m in data]
+    return _categorize_uf_regiao(
+        pd.DataFrame(
+            {
+                "id": [str(m.get("id", "")) for m in items],
+                "nome": [m.get("nome", "") for m in items],
+                "uf": uf,
+                "regiao": _ESTADO_REGIAO.get(uf, ""),
+            },
+            columns=["id", "nome", "uf", "regiao"],
+        )
+    )
 
 
-@st.cache_data(ttl=86400, show_spinner=False)
-def get_municipios_por_uf(uf: str) -> pd.DataFrame:
-    """
-    Fetches the list of municipalities for a given state (UF) from the IBGE API.
+def _categorize_uf_regiao(df: pd.DataFrame) -> pd.DataFrame:
+    # 27 UFs / 5 regions: int8 codes instead of one Python str per row
+    return df.astype({"uf": "category", "regiao": "category"})
 
-    Args:
-        uf (str): The 2-letter state code (e.g., 'SP', 'MG').
 
-    Returns:
-        pd.DataFrame: A DataFrame containing columns ['id', 'nome', 'uf', 'regiao'].
-                      Returns an empty DataFrame on error.
-    """
-    try:
-        r = requests.get(IBGE_MUNICIPIOS_UF.format(uf=uf), timeout=10)
-        r.raise_for_status()
-        data = r.json()
-    except Exception:
-        return pd.DataFrame(columns=["id", "nome", "uf", "regiao"])
-
-    rows: List[Dict] = []
-    regiao = C.ESTADO_REGIAO.get(uf, "")
-    for m in data:
-        mid = str((m or {}).get("id", ""))
-        nome = (m or {}).get("nome", "")
-        rows.append({"id": mid, "nome": nome, "uf": uf, "regiao": regiao})
-    return pd.DataFrame(rows)
+def _pop_frame(ids_l: List[str], vals_l: List) -> pd.DataFrame:
+    # Column-wise construction: one vectorized numeric parse instead of
+    # a dict + int(float(...)) per SIDRA row
+    return pd.DataFrame(
+        {
+            "id": pd.Series(ids_l, dtype=object),
+            "pop_2022": pd.to_numeric(pd.Series(vals_l, dtype=object), errors="coerce")
+            .fillna(0)
+            .astype("int64"),
+        }
+    )
 
 
 @st.cache_data(ttl=86400, show_spinner=False)
 def get_populacao_2022_municipios(ids: List[str]) -> pd.DataFrame:
     if not ids:
         return pd.DataFrame(columns=["id", "pop_2022"])
-    batch = []
-    for i in range(0, len(ids), 40):
-        batch_ids = ids[i : i + 40]
-        url = SIDRA_POP_2022.format(ids="|".join(batch_ids))
-        try:
-            r = requests.get(url, timeout=15)
-            r.raise_for_status()
-            j = r.json()
-            for row in j[1:]:
-                batch.append(
-                    {
-                        "id": str(row.get("D1C", "")),
-                        "pop_2022": int(float(row.get("V", 0))),
-                    }
+    ids_l: List[str] = []
+    vals_l: List[str] = []
+
+    def _append_rows(j):
+        for row in j[1:]:
+            ids_l.append(str(row.get("D1C", "")))
+            vals_l.append(row.get("V", 0))
+
+    # Batches are independent and latency-bound: fetch them concurrently.
+    # A failed batch falls back to one request per id, on the same pool.
+    batches = [ids[i : i + 40] for i in range(0, len(ids), 40)]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        futures = [
+            ex.submit(
+                get_json, SIDRA_POP_2022.format(ids="|".join(b)), _TIMEOUT_NORMAL
+            )
+            for b in batches
+        ]
+        retries = []
+        for batch_ids, fut in zip(batches, futures):
+            try:
+                _append_rows(fut.result())
+            except Exception:
+                retries.extend(
+                    ex.submit(
+                        get_json, SIDRA_POP_2022.format(ids=mid), _TIMEOUT_NORMAL
+                    )
+                    for mid in batch_ids
                 )
-        except Exception:
-            for mid in batch_ids:
-                try:
-                    u = SIDRA_POP_2022.format(ids=mid)
-                    rr = requests.get(u, timeout=15)
-                    rr.raise_for_status()
-                    jj = rr.json()
-                    for row in jj[1:]:
-                        batch.append(
-                            {
-                                "id": str(row.get("D1C", "")),
-                                "pop_2022": int(float(row.get("V", 0))),
-                            }
-                        )
-                except Exception:
-                    continue
-    return pd.DataFrame(batch)
+        for fut in retries:
+            try:
+                _append_rows(fut.result())
+            except Exception:
+                continue
+    return _pop_frame(ids_l, vals_l)
+
+
+# Census 2022 / IBGE territorial data is immutable: persist it on disk so restarts
+# and other workers skip the download (Streamlit ignores `ttl` on persisted
+# caches; the "reload data" button clears them). Errors are raised inside the
+# cached fetchers so that a failed request is never persisted.
+@st.cache_data(show_spinner=False, persist="disk")
+def _fetch_populacao_2022_all() -> pd.DataFrame:
+    rows = iter_json_items(SIDRA_POP_2022_ALL, timeout=_TIMEOUT_SLOW)
+    next(rows, None)  # header row
+    ids_l: List[str] = []
+    vals_l: List = []
+    for row in rows:
+        ids_l.append(str(row.get("D1C", "")))
+        vals_l.append(row.get("V", 0))
+    return _pop_frame(ids_l, vals_l)
+
+
+# In-process copy in front of the disk cache: no cache-key hashing per call
+_POP_2022_ALL = ProcessSingleton(_fetch_populacao_2022_all, ttl=86400)
 
 
-@st.cache_data(ttl=86400, show_spinner=False)
 def get_populacao_2022_all() -> pd.DataFrame:
     """
     Fetches the 2022 Census population for ALL municipalities in Brazil at once.
@@ -91,80 +123,93 @@ def get_populacao_2022_all() -> pd.DataFrame:
 
     Returns:
         pd.DataFrame: A DataFrame with columns ['id', 'pop_2022'].
+                      Shared across sessions: do not modify it in place.
     """
     try:
-        r = requests.get(SIDRA_POP_2022_ALL, timeout=30)
-        r.raise_for_status()
-        j = r.json()
-        rows = []
-        for row in j[1:]:
-            rows.append(
-                {"id": str(row.get("D1C", "")), "pop_2022": int(float(row.get("V", 0)))}
-            )
-        return pd.DataFrame(rows)
+        return _POP_2022_ALL.get()
     except Exception:
         return pd.DataFrame(columns=["id", "pop_2022"])
 
 
-@st.cache_data(ttl=86400, show_spinner=False)
+@st.cache_data(show_spinner=False, persist="disk")
+def _fetch_municipios_por_uf(uf: str) -> pd.DataFrame:
+    r = SESSION.get(IBGE_MUNICIPIOS_UF.format(uf=uf), timeout=_TIMEOUT_FAST)
+    r.raise_for_status()
+    data = decode_json(r)
+    if not isinstance(data, list):
+        raise ValueError(f"Unexpected IBGE response for {uf}")
+    return _municipios_frame(data, uf)
+
+
 def get_municipios_por_uf_simple(uf: str) -> pd.DataFrame:
+    """
+    Fetches the list of municipalities for a given state (UF) from the IBGE API.
+
+    Args:
+        uf (str): The 2-letter state code (e.g., 'SP', 'MG').
+
+    Returns:
+        pd.DataFrame: A DataFrame containing columns ['id', 'nome', 'uf', 'regiao'].
+                      Returns an empty DataFrame on error.
+    """
     try:
-        r = requests.get(IBGE_MUNICIPIOS_UF.format(uf=uf), timeout=10)
-        r.raise_for_status()
-        data = r.json()
+        return _fetch_municipios_por_uf(uf)
     except Exception:
         return pd.DataFrame(columns=["id", "nome", "uf", "regiao"])
 
-    if not isinstance(data, list):
-        return pd.DataFrame(columns=["id", "nome", "uf", "regiao"])
 
-    regiao = C.ESTADO_REGIAO.get(uf, "") if C is not None else ""
-    rows: List[Dict] = []
-    for m in data:
-        mid = str((m or {}).get("id", ""))
-        nome = (m or {}).get("nome", "")
-        rows.append({"id": mid, "nome": nome, "uf": uf, "regiao": regiao})
-    return pd.DataFrame(rows, columns=["id", "nome", "uf", "regiao"])
+# Single implementation (and cache entry) for the UF municipality list
+get_municipios_por_uf = get_municipios_por_uf_simple
+
+
+def _has_ids(mun: pd.DataFrame) -> bool:
+    return not mun.empty and "id" in mun.columns
+
+
+def _build_one_uf(
+    mun: pd.DataFrame, pop_map: Dict[str, int], presentes_keys: Set[str]
+) -> pd.DataFrame:
+    ids = mun["id"].astype(str)
+    df = mun.assign(pop_2022=ids.map(pop_map).fillna(0).astype("int64"))
+    key_series = (
+        df["nome"].astype(str).str.strip().str.upper()
+        + "|"
+        + df["uf"].astype(str).str.strip().str.upper()
+    )
+    df["presenca"] = key_series.isin(presentes_keys).astype(int)
+    df["score"] = df["pop_2022"].astype(float) * (1 - df["presenca"])
+    return df
 
 
 def build_oportunidade_por_uf(
     dados_df: pd.DataFrame, selected_ufs: List[str]
 ) -> pd.DataFrame:
-    presentes = (
-        dados_df[["_cidade", "_estado"]]
-        .dropna()
-        .assign(
-            key=lambda d: d["_cidade"].astype(str).str.strip().str.upper()
-            + "|"
-            + d["_estado"].astype(str).str.strip().str.upper()
+    # One fused pass over the (short) object columns instead of chained .str ops
+    presentes = dados_df[["_cidade", "_estado"]].dropna().astype(str)
+    presentes_keys = {
+        f"{c.strip().upper()}|{e.strip().upper()}"
+        for c, e in zip(
+            presentes["_cidade"].to_numpy(), presentes["_estado"].to_numpy()
         )
-    )
-    presentes_keys = set(presentes["key"].unique().tolist())
+    }
+
+    # UFs are independent and each may hit IBGE: overlap their requests
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        muns = [
+            m for m in ex.map(get_municipios_por_uf_simple, selected_ufs) if _has_ids(m)
+        ]
 
-    frames = []
     pop_all = get_populacao_2022_all()
-    pop_all = pop_all if not pop_all.empty else None
-    for uf in selected_ufs:
-        mun = get_municipios_por_uf_simple(uf)
-        if mun.empty or "id" not in mun.columns:
-            continue
-        if pop_all is not None:
-            df = mun.merge(pop_all, on="id", how="left")
-        else:
-            pop = get_populacao_2022_municipios(mun["id"].astype(str).tolist())
-            df = mun.merge(pop, on="id", how="left")
-        df["pop_2022"] = df["pop_2022"].fillna(0).astype(int)
-        df["presenca"] = df.apply(
-            lambda r: (
-                1
-                if (str(r["nome"]).strip().upper() + "|" + str(r["uf"]).strip().upper())
-                in presentes_keys
-                else 0
-            ),
-            axis=1,
+    if pop_all.empty and muns:
+        # National table unavailable: one batched lookup over every selected
+        # UF's ids, rather than one (pooled) lookup per UF
+        pop_all = get_populacao_2022_municipios(
+            pd.concat([m["id"] for m in muns]).astype(str).tolist()
         )
-        df["score"] = df["pop_2022"].astype(float) * (1 - df["presenca"])
-        frames.append(df)
+    # id -> population lookup built once; a dict map per UF avoids re-hashing
+    # the national table in a merge on every iteration
+    pop_map = dict(zip(pop_all["id"].astype(str), pop_all["pop_2022"]))
+    frames = [_build_one_uf(m, pop_map, presentes_keys) for m in muns]
     out = (
         pd.concat(frames, ignore_index=True)
         if frames
@@ -172,4 +217,6 @@ def build_oportunidade_por_uf(
             columns=["id", "nome", "uf", "regiao", "pop_2022", "presenca", "score"]
         )
     )
+    # Per-UF categoricals have disjoint categories, so concat falls back to object
+    out = _categorize_uf_regiao(out)
     return out.sort_values(["uf", "score"], ascending=[True, False])
@@ -102,6 +102,8 @@ class TestDataService:
         assert df.iloc[0][C.COL_INT_CITY] == "São Paulo"
         assert df.iloc[0][C.COL_INT_PARTNER] == "Partner A"
         assert C.COL_INT_REGION in df.columns # Check region mapping
+        assert isinstance(df[C.COL_INT_STATUS].dtype, pd.CategoricalDtype)
+        assert isinstance(df[C.COL_INT_CONTRACT_TYPE].dtype, pd.CategoricalDtype)
 
     @patch("services.data.load_sheet")
     def test_get_faturamento_processing(self, mock_load_sheet):
@@ -122,3 +124,10 @@ class TestDataService:
         assert not df.empty
         assert df.iloc[0][C.COL_INT_VALOR] == 1000.50
         assert df.iloc[0][C.COL_INT_COMISSAO] == 0.10
+
+    def test_process_column_text_fast_path_matches_apply(self):
+        df = pd.DataFrame({"src": [" sp ", "Rio ", np.nan, 123]})
+        data_service.process_column(df, "src", "upper", data_service.strip_upper_text)
+        data_service.process_column(df, "src", "plain", data_service.strip_text)
+        assert df["upper"].tolist() == df["src"].apply(lambda x: str(x).strip().upper()).tolist()
+        assert df["plain"].tolist() == df["src"].apply(lambda x: str(x).strip()).tolist()
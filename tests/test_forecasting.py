@@ -7,6 +7,9 @@ from forecasting import generate_forecast, generate_smart_insights, run_backtest
 import forecasting # Import module for patching
 
 class TestForecasting:
+    def setup_method(self):
+        forecasting.clear_forecast_cache()
+
     @patch("forecasting.Prophet")
     def test_optimistic_bias(self, mock_prophet_class):
         # Create synthetic historical data (last 30 days stable at 100)
@@ -81,6 +84,53 @@ class TestForecasting:
         # Note: The code fills missing days in history, so if input is continuous 10 days, output history is 10 days.
         assert len(forecast_df) == 15
         assert len(forecast_df[forecast_df["Type"] == "Previsão"]) == 5
+        assert isinstance(forecast_df["Type"].dtype, pd.CategoricalDtype)
+
+    def test_prepare_daily_fills_gaps(self):
+        df = pd.DataFrame({
+            "date": pd.to_datetime(["2023-01-01", "2023-01-01", "2023-01-04"]),
+            "value": [1, 2, 5]
+        })
+
+        daily = forecasting._prepare_daily(df, "date", "value")
+
+        assert daily["date"].tolist() == list(pd.date_range("2023-01-01", "2023-01-04"))
+        assert daily["value"].tolist() == [3, 0, 0, 5]
+
+    def test_forecast_without_type_column(self):
+        dates = pd.date_range(start="2023-01-01", periods=10)
+        df = pd.DataFrame({"date": dates, "value": np.arange(10.0)})
+
+        out, hist_len = generate_forecast(
+            df, "date", "value", "UNKNOWN_ALGO", 5, seed=1, include_type=False
+        )
+        full = generate_forecast(df, "date", "value", "UNKNOWN_ALGO", 5, seed=1)
+
+        assert list(out.columns) == ["date", "value"]
+        assert hist_len == 10
+        pd.testing.assert_frame_equal(out, full[["date", "value"]])
+
+    def test_forecast_seed_reproducible(self):
+        dates = pd.date_range(start="2023-01-01", periods=30)
+        df = pd.DataFrame({"date": dates, "value": np.arange(30) % 7 * 10.0})
+
+        first = generate_forecast(df, "date", "value", "UNKNOWN_ALGO", 10, seed=42)
+        second = generate_forecast(df, "date", "value", "UNKNOWN_ALGO", 10, seed=42)
+
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_forecast_accepts_generator(self):
+        dates = pd.date_range(start="2023-01-01", periods=30)
+        df = pd.DataFrame({"date": dates, "value": np.arange(30) % 7 * 10.0})
+
+        first = generate_forecast(
+            df, "date", "value", "UNKNOWN_ALGO", 10, rng=np.random.default_rng(7)
+        )
+        second = generate_forecast(
+            df, "date", "value", "UNKNOWN_ALGO", 10, rng=np.random.default_rng(7)
+        )
+
+        pd.testing.assert_frame_equal(first, second)
 
     def test_sustainability_floor(self):
         # Scenario: History is 100, but raw forecast (zeros) drops to 0.
@@ -148,6 +198,55 @@ class TestForecasting:
         assert "110" not in insight # It shows totals/averages
         assert "Média diária" in insight
 
+    def test_smart_insights_reuses_forecast_daily_history(self):
+        dates = pd.date_range(end=pd.Timestamp.today(), periods=20)
+        df = pd.DataFrame({"date": dates, "value": np.linspace(10, 100, 20)})
+        forecast_df, daily = generate_forecast(
+            df, "date", "value", "UNKNOWN_ALGO", 5, return_daily=True
+        )
+
+        with patch("forecasting._prepare_daily") as mock_prepare:
+            insight = generate_smart_insights(
+                df, "date", "value", forecast_df, daily=daily
+            )
+
+        mock_prepare.assert_not_called()
+        assert "🚀" in insight
+
+    def test_forecast_result_slices_can_be_concatenated(self):
+        dates = pd.date_range(end=pd.Timestamp.today(), periods=20)
+        df = pd.DataFrame({"date": dates, "value": np.linspace(10, 100, 20)})
+        forecast_df = generate_forecast(df, "date", "value", "UNKNOWN_ALGO", 5)
+
+        is_history = forecast_df["Type"] == C.LABEL_FORECAST_TYPE_HISTORY
+        combined = pd.concat([forecast_df[is_history], forecast_df[~is_history]])
+
+        pd.testing.assert_frame_equal(combined, forecast_df)
+        assert all(
+            not isinstance(v, pd.DataFrame) for v in forecast_df.attrs.values()
+        )
+
+    def test_forecast_summary_matches_frame_totals(self):
+        dates = pd.date_range(end=pd.Timestamp.today(), periods=20)
+        df = pd.DataFrame({"date": dates, "value": np.linspace(10, 100, 20)})
+        forecast_df = generate_forecast(df, "date", "value", "UNKNOWN_ALGO", 5, seed=0)
+
+        summary = forecast_df.attrs["forecast_summary"]
+        is_future = forecast_df["Type"] == C.LABEL_FORECAST_TYPE_FORECAST
+        future = forecast_df.loc[is_future, "value"].to_numpy(dtype=np.float64)
+        history = forecast_df.loc[~is_future, "value"].to_numpy(dtype=np.float64)
+        assert summary["future_sum"] == pytest.approx(future.sum())
+        assert summary["future_mean"] == pytest.approx(future.mean())
+        assert summary["history_sum"] == pytest.approx(history.sum())
+
+    def test_smart_insights_trend_is_weekly_slope(self):
+        # +1/day around a level of 106.5 over the last 14 days -> +6.6%/week
+        history = 100.0 + np.arange(14)
+        insight = forecasting._smart_insights_from_arrays(history, np.full(5, 110.0))
+
+        assert "(+6.6%)" in insight
+        assert C.INSIGHT_GROWTH in insight
+
     def test_smart_insights_insufficient_data(self):
         dates = pd.date_range(end=pd.Timestamp.today(), periods=5)
         df = pd.DataFrame({"date": dates, "value": [10]*5})
@@ -229,6 +328,9 @@ class TestForecasting:
         assert len(forecast_df[forecast_df["Type"] == "Previsão"]) == 5
         # 10 history + 5 forecast = 15
         assert len(forecast_df) == 15
+        # Only the horizon is sent to predict
+        predict_df = m.predict.call_args[0][0]
+        assert predict_df["ds"].tolist() == list(future_dates)
 
     # --- Backtesting Tests ---
 
@@ -278,7 +380,7 @@ class TestForecasting:
         assert result["mae"] < 50.0 
 
     def test_run_backtest_metrics_calculation(self):
-        # We need to mock generate_forecast to return deterministic values
+        # We need to mock the forecast step to return deterministic values
         # so we can verify MAE/RMSE calculation exactly.
         
         dates = pd.date_range(start="2023-01-01", periods=10) # 10 days total
@@ -296,26 +398,27 @@ class TestForecasting:
         # RMSE = 5
         # MAPE = (5/20) = 25%
         
-        # Mock generate_forecast
-        with patch("forecasting.generate_forecast") as mock_gen:
+        # Mock the forecast step (run_backtest feeds it the aggregated train set)
+        with patch("forecasting._generate_forecast_from_daily") as mock_gen:
             # Prepare mock return
             # It needs to return history + forecast
             # History (train) dates: Jan 1 to Jan 5
             # Forecast (test) dates: Jan 6 to Jan 10
             
+            # (called with include_type=False: frame + number of history rows)
             history_df = pd.DataFrame({
                 "date": dates[:5],
                 "value": [10]*5,
-                "Type": [C.UI_LABEL_HISTORY]*5
             })
             
             forecast_df = pd.DataFrame({
                 "date": dates[5:],
                 "value": [15.0]*5, # Predicted
-                "Type": [C.UI_LABEL_FORECAST]*5
             })
             
-            mock_gen.return_value = pd.concat([history_df, forecast_df])
+            mock_gen.return_value = (
+                pd.concat([history_df, forecast_df], ignore_index=True), 5
+            )
             
             result = forecasting.run_backtest(
                 df=df,
@@ -341,14 +444,13 @@ class TestForecasting:
             "value": [10, 10, 0, 100]
         })
         
-        with patch("forecasting.generate_forecast") as mock_gen:
+        with patch("forecasting._generate_forecast_from_daily") as mock_gen:
             forecast_df = pd.DataFrame({
                 "date": dates[2:],
                 "value": [10.0, 10.0],
-                "Type": [C.UI_LABEL_FORECAST]*2
             })
-            # We don't strictly need history in return for backtest logic, but good practice
-            mock_gen.return_value = forecast_df 
+            # We don't strictly need history in return for backtest logic (0 history rows)
+            mock_gen.return_value = (forecast_df, 0)
             
             result = forecasting.run_backtest(df, "date", "value", "Dummy", test_days=2)
             
@@ -362,6 +464,20 @@ class TestForecasting:
             assert result["mape"] == 90.0
 
 
+    def test_run_backtest_multi(self):
+        dates = pd.date_range(end=pd.Timestamp.today(), periods=60)
+        df = pd.DataFrame({"date": dates, "value": [100.0]*60})
+
+        with patch("forecasting.PROPHET_AVAILABLE", False):
+            results = forecasting.run_backtest_multi(
+                df, "date", "value", ["Naive", C.ALGORITHM_PROPHET], test_days=10
+            )
+
+        assert list(results) == ["Naive", C.ALGORITHM_PROPHET]
+        assert results["Naive"]["mae"] < 50.0
+        assert results[C.ALGORITHM_PROPHET] == {"error": C.ERR_MSG_PROPHET_NOT_INSTALLED}
+
+
     @patch("forecasting.ExponentialSmoothing")
     def test_generate_forecast_holt_winters(self, mock_es_class):
         # Mock fit return
@@ -369,9 +485,10 @@ class TestForecasting:
         mock_es_class.return_value.fit.return_value = model_fit
         model_fit.forecast.return_value = pd.Series([10, 11, 12, 13, 14])
         
+        # Needs enough non-flat history, otherwise the fit is short-circuited
         df = pd.DataFrame({
-            "date": pd.date_range(start="2023-01-01", periods=10),
-            "value": [10] * 10
+            "date": pd.date_range(start="2023-01-01", periods=20),
+            "value": np.arange(20) % 5 + 10
         })
         
         with patch("forecasting.STATSMODELS_AVAILABLE", True):
@@ -382,3 +499,57 @@ class TestForecasting:
             assert len(forecast_df[forecast_df["Type"] == "Previsão"]) == 5
             mock_es_class.assert_called()
             model_fit.forecast.assert_called()
+
+    @patch("forecasting.ExponentialSmoothing")
+    def test_generate_forecast_holt_winters_flat_series(self, mock_es_class):
+        # Flat / short history skips the fit and forecasts the mean
+        df = pd.DataFrame({
+            "date": pd.date_range(start="2023-01-01", periods=10),
+            "value": [10] * 10
+        })
+        
+        with patch("forecasting.STATSMODELS_AVAILABLE", True):
+            forecast_df = generate_forecast(
+                df, "date", "value", C.ALGORITHM_HOLT_WINTERS, 5
+            )
+            
+        assert len(forecast_df[forecast_df["Type"] == "Previsão"]) == 5
+        mock_es_class.assert_not_called()
+
+    def test_generate_forecast_memoizes_identical_calls(self):
+        df = pd.DataFrame({
+            "date": pd.date_range(start="2023-01-01", periods=20),
+            "value": np.arange(20) % 5 + 10.0
+        })
+
+        first = generate_forecast(df, "date", "value", "UNKNOWN_ALGO", 5)
+        with patch("forecasting._generate_forecast_from_daily") as mock_gen:
+            second = generate_forecast(df, "date", "value", "UNKNOWN_ALGO", 5)
+            mock_gen.assert_not_called()
+        pd.testing.assert_frame_equal(first, second)
+
+        # Callers can't corrupt the cached result
+        second["value"] = -1.0
+        third = generate_forecast(df, "date", "value", "UNKNOWN_ALGO", 5)
+        pd.testing.assert_frame_equal(first, third)
+
+        # A different horizon is a different entry
+        with patch("forecasting._generate_forecast_from_daily") as mock_gen:
+            generate_forecast(df, "date", "value", "UNKNOWN_ALGO", 6)
+            mock_gen.assert_called_once()
+
+    @patch("forecasting.ExponentialSmoothing")
+    def test_holt_winters_fit_reused_across_horizons(self, mock_es_class):
+        model_fit = mock_es_class.return_value.fit.return_value
+        model_fit.forecast.side_effect = lambda h: pd.Series([10.0] * h)
+        df = pd.DataFrame({
+            "date": pd.date_range(start="2023-01-01", periods=20),
+            "value": np.arange(20) % 5 + 10
+        })
+
+        with patch("forecasting.STATSMODELS_AVAILABLE", True):
+            generate_forecast(df, "date", "value", C.ALGORITHM_HOLT_WINTERS, 5)
+            generate_forecast(df, "date", "value", C.ALGORITHM_HOLT_WINTERS, 10)
+
+        assert mock_es_class.return_value.fit.call_count == 1
+        assert model_fit.forecast.call_count == 2
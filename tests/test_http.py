@@ -0,0 +1,31 @@
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+from services import _http
+
+
+ROWS = [{"D1C": "Cód.", "V": "Valor"}, {"D1C": "3550308", "V": "11451999"}]
+
+
+def _response(payload):
+    r = MagicMock()
+    r.__enter__.return_value = r
+    r.raw = io.BytesIO(json.dumps(payload).encode())
+    r.content = r.raw.getvalue()
+    r.json.return_value = payload
+    return r
+
+
+class TestIterJsonItems:
+    @patch("services._http.SESSION")
+    def test_streams_array_items(self, mock_session):
+        mock_session.get.return_value = _response(ROWS)
+        assert list(_http.iter_json_items("http://x", 5)) == ROWS
+        assert mock_session.get.call_args.kwargs["stream"] is True
+
+    @patch("services._http.IJSON_AVAILABLE", False)
+    @patch("services._http.SESSION")
+    def test_falls_back_to_full_decode(self, mock_session):
+        mock_session.get.return_value = _response(ROWS)
+        assert list(_http.iter_json_items("http://x", 5)) == ROWS
@@ -93,3 +93,21 @@ class TestIntegration:
                 
                 # Verify Nominatim was NOT called
                 mock_nominatim.assert_not_called()
+
+    def test_geocoding_timeout_negative_cache(self, tmp_path):
+        # A timed-out lookup is remembered for `failure_ttl` seconds
+        from geopy.exc import GeocoderTimedOut
+
+        db_path = str(tmp_path / "geo.db")
+        with patch("geocoding_service.time.sleep"), patch(
+            "geopy.geocoders.Nominatim.geocode", side_effect=GeocoderTimedOut()
+        ) as mock_nominatim:
+            geo_service = GeocodingService(db_path=db_path)
+            assert geo_service.get_coords("SlowCity", "SP") == (None, None)
+            assert geo_service.get_coords("SlowCity", "SP") == (None, None)
+            assert mock_nominatim.call_count == 1
+
+            # Expired TTL: the API is tried again
+            geo_service.failure_ttl = -1
+            geo_service.get_coords("SlowCity", "SP")
+            assert mock_nominatim.call_count == 2
@@ -0,0 +1,42 @@
+import pytest
+from unittest.mock import patch
+from services import map_service
+
+
+MUNICIPIOS = [
+    {"id": 3550308, "nome": "São Paulo",
+     "microrregiao": {"mesorregiao": {"UF": {"sigla": "SP"}}}},
+    {"id": 5300108, "nome": "Brasília",
+     "microrregiao": None,
+     "regiao-imediata": {"regiao-intermediaria": {"UF": {"sigla": "DF"}}}},
+    {"id": 1, "nome": "Broken", "microrregiao": {"mesorregiao": None}},
+]
+
+
+class TestMapService:
+    def setup_method(self):
+        map_service._build_municipio_index.clear()
+        map_service.get_ibge_code.clear()
+        map_service.get_ibge_codes_bulk.clear()
+
+    def test_normalize_string(self):
+        assert map_service.normalize_string("  São Paulo ") == "sao paulo"
+        assert map_service.normalize_string("Brasilia") == "brasilia"
+        assert map_service.normalize_string(None) == ""
+
+    @patch("services.map_service.get_all_municipios", return_value=MUNICIPIOS)
+    def test_get_ibge_code(self, mock_all):
+        assert map_service.get_ibge_code("sao paulo", "sp") == "3550308"
+        assert map_service.get_ibge_code("BRASÍLIA", "DF") == "5300108"
+        assert map_service.get_ibge_code("São Paulo", "RJ") is None
+        # The municipality list is only walked once
+        assert mock_all.call_count == 1
+
+    @patch("services.map_service.get_all_municipios", return_value=MUNICIPIOS)
+    def test_get_ibge_codes_bulk(self, mock_all):
+        pairs = (("sao paulo", "sp"), ("BRASÍLIA", "DF"), ("São Paulo", "RJ"))
+        assert map_service.get_ibge_codes_bulk(pairs) == {
+            ("sao paulo", "sp"): "3550308",
+            ("BRASÍLIA", "DF"): "5300108",
+            ("São Paulo", "RJ"): None,
+        }
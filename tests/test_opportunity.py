@@ -0,0 +1,50 @@
+import pandas as pd
+from unittest.mock import patch
+
+from services import opportunity
+
+
+def _municipios(uf, rows):
+    return opportunity._municipios_frame(
+        [{"id": i, "nome": n} for i, n in rows], uf
+    )
+
+
+class TestBuildOportunidade:
+    @patch("services.opportunity.get_populacao_2022_all")
+    @patch("services.opportunity.get_municipios_por_uf_simple")
+    def test_scores_and_presence(self, mock_mun, mock_pop):
+        mock_mun.side_effect = lambda uf: {
+            "SP": _municipios("SP", [(1, "Campinas"), (2, "Santos")]),
+            "RS": _municipios("RS", [(3, "Pelotas")]),
+        }[uf]
+        mock_pop.return_value = pd.DataFrame(
+            {"id": ["1", "2", "3"], "pop_2022": [1000, 400, 300]}
+        )
+        dados = pd.DataFrame({"_cidade": [" santos "], "_estado": ["sp"]})
+
+        out = opportunity.build_oportunidade_por_uf(dados, ["SP", "RS"])
+
+        assert out["id"].tolist() == ["3", "1", "2"]
+        assert out["presenca"].tolist() == [0, 0, 1]
+        assert out["score"].tolist() == [300.0, 1000.0, 0.0]
+        assert out["uf"].dtype == "category"
+
+    @patch("services.opportunity.get_populacao_2022_municipios")
+    @patch("services.opportunity.get_populacao_2022_all")
+    @patch("services.opportunity.get_municipios_por_uf_simple")
+    def test_falls_back_to_one_population_lookup(self, mock_mun, mock_all, mock_uf_pop):
+        mock_mun.side_effect = lambda uf: {
+            "SP": _municipios("SP", [(1, "Campinas")]),
+            "RS": _municipios("RS", [(3, "Pelotas")]),
+        }[uf]
+        mock_all.return_value = pd.DataFrame(columns=["id", "pop_2022"])
+        mock_uf_pop.return_value = pd.DataFrame(
+            {"id": ["1", "3"], "pop_2022": [50, 30]}
+        )
+        dados = pd.DataFrame({"_cidade": [], "_estado": []})
+
+        out = opportunity.build_oportunidade_por_uf(dados, ["SP", "RS"])
+
+        assert out["pop_2022"].tolist() == [30, 50]
+        mock_uf_pop.assert_called_once_with(["1", "3"])
@@ -0,0 +1,30 @@
+import pytest
+from unittest.mock import MagicMock
+
+from services._singleton import ProcessSingleton, clear_all
+
+
+class TestProcessSingleton:
+    def test_fetches_once_until_cleared(self):
+        fetch = MagicMock(return_value=[1, 2])
+        singleton = ProcessSingleton(fetch, ttl=60)
+        assert singleton.get() == [1, 2]
+        assert singleton.get() == [1, 2]
+        assert fetch.call_count == 1
+
+        clear_all()
+        singleton.get()
+        assert fetch.call_count == 2
+
+    def test_failures_are_not_stored(self):
+        fetch = MagicMock(side_effect=[RuntimeError("down"), "ok"])
+        singleton = ProcessSingleton(fetch, ttl=60)
+        with pytest.raises(RuntimeError):
+            singleton.get()
+        assert singleton.get() == "ok"
+
+    def test_expired_value_is_refetched(self):
+        fetch = MagicMock(side_effect=["old", "new"])
+        singleton = ProcessSingleton(fetch, ttl=0)
+        assert singleton.get() == "old"
+        assert singleton.get() == "new"
@@ -2,18 +2,30 @@ import plotly.graph_objects as go
 import constants as C
 
 
+# Static parts of every gauge, built once at import
+_GAUGE_STYLE = {"bar": {"color": C.COLOR_SECONDARY}, "bgcolor": C.COLOR_BG_DARK}
+_GAUGE_LAYOUT = {"height": 250, "margin": {"l": 10, "r": 10, "t": 40, "b": 10}}
+
+
+def safe_pct(num: float, denom: float) -> float | None:
+    """`num` as a percentage of `denom`, or None when `denom` is not positive."""
+    return (num / denom * 100.0) if denom > 0 else None
+
+
+def safe_ratio(num: float, denom: float, default: float = 0.0) -> float:
+    """`num / denom`, or `default` when `denom` is not positive."""
+    return (num / denom) if denom > 0 else default
+
+
 def gauge_chart(value: float, target: float, title: str) -> go.Figure:
-    fig = go.Figure(
-        go.Indicator(
+    # Layout goes through the constructor: one validation pass instead of a
+    # second `update_layout` walk over the figure
+    return go.Figure(
+        data=go.Indicator(
             mode="gauge+number",
             value=value,
             title={"text": title},
-            gauge={
-                "axis": {"range": [0, target]},
-                "bar": {"color": C.COLOR_SECONDARY},
-                "bgcolor": C.COLOR_BG_DARK,
-            },
-        )
+            gauge={**_GAUGE_STYLE, "axis": {"range": [0, target]}},
+        ),
+        layout=_GAUGE_LAYOUT,
     )
-    fig.update_layout(height=250, margin=dict(l=10, r=10, t=40, b=10))
-    return fig
@@ -1,82 +1,318 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 from datetime import date, timedelta
 import constants as C
-from ui.components import gauge_chart
+from ui.components import gauge_chart, safe_pct
 
+_MONTH_NAME_TO_NUM = {v: k for k, v in C.MONTH_NAMES.items()}
 
-def render(df: pd.DataFrame, end_date: date, selected_month: int | None):
-    col_a, col_b, col_c, col_d = st.columns([1, 1, 1, 1])
 
-    status_counts = df[C.COL_INT_STATUS].value_counts()
-    signed_df_full = df[df[C.COL_INT_STATUS] == C.STATUS_ASSINADO].copy()
-    signed_df_full["_pid"] = signed_df_full[C.COL_INT_PARTNER].astype(str).str.strip()
-    signed_df_full["_pid"] = signed_df_full["_pid"].where(
-        signed_df_full["_pid"] != "",
-        signed_df_full[C.COL_INT_CEP].astype(str).str.strip(),
+def _with_pid(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds the partner id `_pid` used to count unique partners: the partner
+    column, falling back to the CEP and then to "city|state" when blank.
+    These columns already arrive as stripped strings from `get_dados`.
+    """
+    pid = df[C.COL_INT_PARTNER]
+    pid = pid.where(pid != "", df[C.COL_INT_CEP])
+    pid = pid.where(
+        pid != "", df[C.COL_INT_CITY] + "|" + df[C.COL_INT_STATE]
     )
-    signed_df_full["_pid"] = signed_df_full["_pid"].where(
-        signed_df_full["_pid"] != "",
-        signed_df_full[C.COL_INT_CITY].astype(str).str.strip()
-        + "|"
-        + signed_df_full[C.COL_INT_STATE].astype(str).str.strip(),
+    # Shallow copy of the caller's frame (this helper is deliberately not
+    # cached, so nothing is pickled): only the new `_pid` column is allocated,
+    # where `assign` would deep-copy every column
+    out = df.copy(deep=False)
+    out["_pid"] = pid
+    return out
+
+
+def _window_unique_counts(codes: np.ndarray, n_unique: int, masks) -> list[int]:
+    """
+    Number of distinct partner codes selected by each mask, for all windows
+    in one scatter into a (windows x partners) bitmap.
+    """
+    masks = np.stack([np.asarray(m, dtype=bool) for m in masks])
+    seen = np.zeros((masks.shape[0], n_unique), dtype=bool)
+    rows, cols = np.nonzero(masks)
+    seen[rows, codes[cols]] = True
+    return seen.sum(axis=1).tolist()
+
+
+# Figure builders take the small summary tables as tuples of rows and are
+# cached as resources, so an unchanged table reuses the same Figure object
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _pie_by_captador(rows: tuple) -> go.Figure:
+    by_captador = pd.DataFrame(
+        list(rows), columns=[C.UI_LABEL_CAPTADOR, C.UI_LABEL_PARTNERS]
+    )
+    return px.pie(
+        by_captador,
+        names=C.UI_LABEL_CAPTADOR,
+        values=C.UI_LABEL_PARTNERS,
+        title=C.UI_LABEL_CONTRACTS_BY_CAPTADOR,
+        color_discrete_sequence=px.colors.sequential.Pinkyl,
     )
-    signed_count = signed_df_full.drop_duplicates(subset=["_pid"]).shape[0]
-    waiting_count = int(status_counts.get(C.STATUS_AGUARDANDO, 0))
 
-    col_a.metric(C.UI_LABEL_CONTRACTS_SIGNED, signed_count)
-    col_b.metric(C.UI_LABEL_CONTRACTS_WAITING, waiting_count)
 
-    now = date.today()
-    focus_year = end_date.year if isinstance(end_date, date) else now.year
-    focus_month = selected_month if selected_month is not None else now.month
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _status_bar(rows: tuple) -> go.Figure:
+    status_df = pd.DataFrame(
+        list(rows), columns=[C.UI_LABEL_STATUS, C.UI_LABEL_QUANTITY]
+    )
+    return px.bar(
+        status_df,
+        x=C.UI_LABEL_STATUS,
+        y=C.UI_LABEL_QUANTITY,
+        title=C.UI_LABEL_SIGNED_VS_WAITING,
+        color=C.UI_LABEL_STATUS,
+        color_discrete_map={
+            C.STATUS_ASSINADO: C.COLOR_PRIMARY,
+            C.STATUS_AGUARDANDO: C.COLOR_SECONDARY,
+        },
+    )
+
 
-    signed_df = df[df[C.COL_INT_STATUS] == C.STATUS_ASSINADO].copy()
-    signed_df["_pid"] = signed_df[C.COL_INT_PARTNER].astype(str).str.strip()
-    signed_df["_pid"] = signed_df["_pid"].where(
-        signed_df["_pid"] != "",
-        signed_df[C.COL_INT_CEP].astype(str).str.strip(),
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _monthly_bar(rows: tuple) -> go.Figure:
+    """`rows` are (year, month, unique partners), sorted by month."""
+    monthly = pd.DataFrame(
+        list(rows), columns=["_ano", "_mes", C.UI_LABEL_CONTRACTS]
+    ).astype({"_ano": np.int32, "_mes": np.int32})
+    labels = (
+        monthly["_mes"].map(C.MONTH_NAMES).fillna(monthly["_mes"].astype(str))
+        + " "
+        + monthly["_ano"].astype(str)
     )
-    signed_df["_pid"] = signed_df["_pid"].where(
-        signed_df["_pid"] != "",
-        signed_df[C.COL_INT_CITY].astype(str).str.strip()
-        + "|"
-        + signed_df[C.COL_INT_STATE].astype(str).str.strip(),
+    # Rows arrive in chronological order, so the labels are already the
+    # category order; the ordered categorical keeps the axis chronological
+    monthly[C.UI_LABEL_MONTH] = pd.Categorical(
+        labels, categories=labels.tolist(), ordered=True
+    )
+    fig_month = px.bar(
+        monthly,
+        x=C.UI_LABEL_MONTH,
+        y=C.UI_LABEL_CONTRACTS,
+        title=C.UI_LABEL_SIGNED_BY_MONTH,
+        color_discrete_sequence=[C.COLOR_PRIMARY],
+        custom_data=["_ano", "_mes"],
     )
+    
+    # Meta Visual
+    fig_month.add_hline(
+        y=C.GOAL_MONTHLY_CONTRACTS, 
+        line_dash="dash", 
+        line_color="green", 
+        annotation_text="Meta",
+        annotation_position="top right"
+    )
+    return fig_month
+
+
+# Bounded: each entry is keyed on a full filtered frame
+@st.cache_data(show_spinner=False, max_entries=16)
+def _compute_contracts(
+    df: pd.DataFrame, end_date: date, selected_month: int | None, today: date
+) -> dict:
+    """
+    All the pandas work behind the contracts tab, cached on its inputs so a
+    rerun with the same filters only redraws. `today` is an argument so the
+    fallbacks to the current date are part of the cache key.
+    """
+    df = _with_pid(df)
+
+    status_counts = df[C.COL_INT_STATUS].value_counts()
+    waiting_count = int(status_counts.get(C.STATUS_AGUARDANDO, 0))
+
+    focus_year = end_date.year if isinstance(end_date, date) else today.year
+    focus_month = selected_month if selected_month is not None else today.month
 
-    month_mask = (signed_df[C.COL_INT_DT].dt.year == focus_year) & (
-        signed_df[C.COL_INT_DT].dt.month == focus_month
+    status = df[C.COL_INT_STATUS]
+    # One signed filter for the whole tab; categorical compares run on codes
+    is_signed = (status == C.STATUS_ASSINADO).to_numpy()
+    signed_df = df[is_signed]
+    # Hash `_pid` once; each window below counts partners on the int codes
+    pid_codes, pid_uniques = pd.factorize(signed_df["_pid"], sort=False)
+    n_pids = len(pid_uniques)
+    signed_count = n_pids
+
+    # Day/year/month arrays extracted once, all in datetime64 arithmetic;
+    # `.dt.date` would box every row. Year/month of NaT rows are garbage but
+    # never match a window and are dropped by `dated` below.
+    days = signed_df[C.COL_INT_DT].to_numpy(dtype="datetime64[ns]").astype(
+        "datetime64[D]"
     )
-    month_count = signed_df[month_mask].drop_duplicates(subset=["_pid"]).shape[0]
+    month_index = days.astype("datetime64[M]").astype(np.int64)
+    years = month_index // 12 + 1970
+    months = month_index % 12 + 1
+    # Rows with a date, shared by the monthly and daily series
+    dated = ~np.isnat(days)
+
+    # The focus-year compare is shared by the month/quarter/semester masks
+    in_focus_year = years == focus_year
+    month_mask = np.logical_and(in_focus_year, months == focus_month)
 
-    week_end_date = end_date if isinstance(end_date, date) else date.today()
+    week_end_date = end_date if isinstance(end_date, date) else today
     week_start_date = week_end_date - timedelta(days=week_end_date.weekday())
-    week_mask = (signed_df[C.COL_INT_DT].dt.date >= week_start_date) & (
-        signed_df[C.COL_INT_DT].dt.date <= (week_start_date + timedelta(days=6))
+    week_lo = np.datetime64(week_start_date, "D")
+    week_mask = (days >= week_lo) & (days <= week_lo + 6)
+
+    today_date = end_date if isinstance(end_date, date) else today
+    today_mask = days == np.datetime64(today_date, "D")
+
+    last_week_lo = week_lo - 7
+    last_week_mask = (days >= last_week_lo) & (days <= last_week_lo + 6)
+
+    prev_year = focus_year if focus_month > 1 else focus_year - 1
+    prev_month = focus_month - 1 if focus_month > 1 else 12
+    last_month_mask = (years == prev_year) & (months == prev_month)
+
+    q_start = ((focus_month - 1) // 3) * 3 + 1
+    quarterly_mask = np.logical_and.reduce(
+        (in_focus_year, months >= q_start, months <= q_start + 2)
     )
-    week_count = signed_df[week_mask].drop_duplicates(subset=["_pid"]).shape[0]
 
-    col_c.metric(C.UI_LABEL_SIGNED_MONTH, month_count)
-    col_d.metric(C.UI_LABEL_SIGNED_WEEK, week_count)
+    sem_start = 1 if focus_month <= 6 else 7
+    semestral_mask = np.logical_and.reduce(
+        (in_focus_year, months >= sem_start, months <= sem_start + 5)
+    )
 
-    today_date = end_date if isinstance(end_date, date) else date.today()
-    today_mask = signed_df[C.COL_INT_DT].dt.date == today_date
-    today_count = signed_df[today_mask].drop_duplicates(subset=["_pid"]).shape[0]
-    h1, h2, h3 = st.columns(3)
-    h1.metric(C.UI_LABEL_SIGNED_TODAY, today_count)
+    (
+        month_count,
+        week_count,
+        today_count,
+        last_week_count,
+        last_month_count,
+        quarterly_count,
+        semiannual_count,
+    ) = _window_unique_counts(
+        pid_codes,
+        n_pids,
+        (
+            month_mask,
+            week_mask,
+            today_mask,
+            last_week_mask,
+            last_month_mask,
+            quarterly_mask,
+            semestral_mask,
+        ),
+    )
 
-    last_week_start = week_start_date - timedelta(days=7)
-    last_week_mask = (signed_df[C.COL_INT_DT].dt.date >= last_week_start) & (
-        signed_df[C.COL_INT_DT].dt.date <= (last_week_start + timedelta(days=6))
+    # First row of each partner straight from the codes: factorize numbers
+    # them in order of appearance, so this matches drop_duplicates(keep="first")
+    _, first_pos = np.unique(pid_codes, return_index=True)
+    by_captador = (
+        signed_df[C.COL_INT_CAPTADOR].iloc[first_pos].value_counts().reset_index()
     )
-    last_week_count = (
-        signed_df[last_week_mask].drop_duplicates(subset=["_pid"]).shape[0]
+    captador_rows = tuple(by_captador.itertuples(index=False, name=None))
+
+    rank = np.full(len(status), -1, dtype=np.int8)
+    rank[is_signed] = 2
+    rank[(status == C.STATUS_AGUARDANDO).to_numpy()] = 1
+    rank[(status == C.STATUS_CANCELADO).to_numpy()] = 0
+    # Best-ranked row per partner in one hash pass; positional so a
+    # non-unique index can't pull in extra rows
+    best_pos = (
+        pd.Series(rank)
+        .groupby(df["_pid"].to_numpy(), sort=False)
+        .idxmax()
+        .to_numpy()
     )
-    diff_week = week_count - last_week_count
-    progress_pct_week = (
-        (week_count / last_week_count * 100.0) if last_week_count > 0 else None
+    # Only the status column of the winning rows is needed, not the frame
+    status_counts_dedup = status.iloc[best_pos].value_counts()
+    # Only the two statuses the bar chart shows
+    status_keys = [C.STATUS_ASSINADO, C.STATUS_AGUARDANDO]
+    status_rows = tuple(
+        (k, int(status_counts_dedup.get(k, 0))) for k in status_keys
+    )
+
+    # Unique partners per month on the int pid codes: distinct (month, code)
+    # pairs, then pairs per month. np.unique leaves the months sorted.
+    ym = month_index[dated]
+    stride = max(n_pids, 1)
+    month_pairs = np.unique(ym * stride + pid_codes[dated])
+    ym_keys, ym_counts = np.unique(month_pairs // stride, return_counts=True)
+    monthly_rows = tuple(
+        zip(
+            (ym_keys // 12 + 1970).tolist(),
+            (ym_keys % 12 + 1).tolist(),
+            ym_counts.tolist(),
+        )
+    )
+
+    # Unique partners per day for the daily drill-down, so a click only
+    # filters this small table. Same pair trick as the monthly series, on
+    # factorized partner names (the drill-down counts names, not `_pid`).
+    partner_codes, partner_uniques = pd.factorize(
+        signed_df[C.COL_INT_PARTNER].to_numpy()[dated]
+    )
+    named = partner_codes >= 0
+    day_stride = max(len(partner_uniques), 1)
+    day_pairs = np.unique(
+        days[dated][named].astype(np.int64) * day_stride + partner_codes[named]
+    )
+    day_keys, day_counts = np.unique(day_pairs // day_stride, return_counts=True)
+    day_index = pd.DatetimeIndex(day_keys.astype("datetime64[D]"))
+    daily = pd.DataFrame(
+        {
+            "_ano": day_index.year,
+            "_mes": day_index.month,
+            "Dia": day_index.day,
+            C.UI_LABEL_CONTRACTS: day_counts,
+        }
     )
+
+    return {
+        "signed_count": signed_count,
+        "waiting_count": waiting_count,
+        "month_count": month_count,
+        "week_count": week_count,
+        "today_count": today_count,
+        "last_week_count": last_week_count,
+        "last_month_count": last_month_count,
+        "quarterly_count": quarterly_count,
+        "semiannual_count": semiannual_count,
+        "focus_year": focus_year,
+        "focus_month": focus_month,
+        "captador_rows": captador_rows,
+        "status_rows": status_rows,
+        "monthly_rows": monthly_rows,
+        "daily": daily,
+    }
+
+
+def render(df: pd.DataFrame, end_date: date, selected_month: int | None):
+    # Nothing survives the filters: skip hashing and computing over no rows
+    if df.empty:
+        col_a, col_b, col_c, col_d = st.columns([1, 1, 1, 1])
+        col_a.metric(C.UI_LABEL_CONTRACTS_SIGNED, 0)
+        col_b.metric(C.UI_LABEL_CONTRACTS_WAITING, 0)
+        col_c.metric(C.UI_LABEL_SIGNED_MONTH, 0)
+        col_d.metric(C.UI_LABEL_SIGNED_WEEK, 0)
+        st.info(C.UI_LABEL_NO_CONTRACTS_FOUND)
+        return
+
+    m = _compute_contracts(df, end_date, selected_month, date.today())
+    month_count = m["month_count"]
+    week_count = m["week_count"]
+    last_week_count = m["last_week_count"]
+    last_month_count = m["last_month_count"]
+    focus_year = m["focus_year"]
+    focus_month = m["focus_month"]
+
+    col_a, col_b, col_c, col_d = st.columns([1, 1, 1, 1])
+    col_a.metric(C.UI_LABEL_CONTRACTS_SIGNED, m["signed_count"])
+    col_b.metric(C.UI_LABEL_CONTRACTS_WAITING, m["waiting_count"])
+    col_c.metric(C.UI_LABEL_SIGNED_MONTH, month_count)
+    col_d.metric(C.UI_LABEL_SIGNED_WEEK, week_count)
+
+    h1, h2, h3 = st.columns(3)
+    h1.metric(C.UI_LABEL_SIGNED_TODAY, m["today_count"])
+    diff_week = week_count - last_week_count
+    progress_pct_week = safe_pct(week_count, last_week_count)
     h2.metric(
         (
             C.UI_LABEL_VS_LAST_WEEK_UP
@@ -86,19 +322,8 @@ def render(df: pd.DataFrame, end_date: date, selected_month: int | None):
         abs(diff_week),
         delta=(f"{progress_pct_week:.1f}%" if progress_pct_week is not None else None),
     )
-
-    prev_year = focus_year if focus_month > 1 else focus_year - 1
-    prev_month = focus_month - 1 if focus_month > 1 else 12
-    last_month_mask = (signed_df[C.COL_INT_DT].dt.year == prev_year) & (
-        signed_df[C.COL_INT_DT].dt.month == prev_month
-    )
-    last_month_count = (
-        signed_df[last_month_mask].drop_duplicates(subset=["_pid"]).shape[0]
-    )
     diff_month = month_count - last_month_count
-    progress_pct_month = (
-        (month_count / last_month_count * 100.0) if last_month_count > 0 else None
-    )
+    progress_pct_month = safe_pct(month_count, last_month_count)
     h3.metric(
         C.UI_LABEL_VS_LAST_MONTH_UP if diff_month > 0 else C.UI_LABEL_VS_LAST_MONTH_DOWN,
         abs(diff_month),
@@ -107,128 +332,19 @@ def render(df: pd.DataFrame, end_date: date, selected_month: int | None):
         ),
     )
 
-    q_start = ((focus_month - 1) // 3) * 3 + 1
-    quarterly_mask = (
-        (signed_df[C.COL_INT_DT].dt.year == focus_year)
-        & (signed_df[C.COL_INT_DT].dt.month >= q_start)
-        & (signed_df[C.COL_INT_DT].dt.month <= q_start + 2)
-    )
-    quarterly_count = (
-        signed_df[quarterly_mask].drop_duplicates(subset=["_pid"]).shape[0]
-    )
-
-    sem_start = 1 if focus_month <= 6 else 7
-    semestral_mask = (
-        (signed_df[C.COL_INT_DT].dt.year == focus_year)
-        & (signed_df[C.COL_INT_DT].dt.month >= sem_start)
-        & (signed_df[C.COL_INT_DT].dt.month <= sem_start + 5)
-    )
-    semiannual_count = (
-        signed_df[semestral_mask].drop_duplicates(subset=["_pid"]).shape[0]
-    )
-
     g1, g2, g3 = st.columns([1, 1, 1])
     g1.plotly_chart(gauge_chart(month_count, 30, C.UI_LABEL_GOAL_MONTHLY), width="stretch")
     g2.plotly_chart(
-        gauge_chart(quarterly_count, 90, C.UI_LABEL_GOAL_QUARTERLY), width="stretch"
+        gauge_chart(m["quarterly_count"], 90, C.UI_LABEL_GOAL_QUARTERLY), width="stretch"
     )
     g3.plotly_chart(
-        gauge_chart(semiannual_count, 180, C.UI_LABEL_GOAL_SEMIANNUAL), width="stretch"
+        gauge_chart(m["semiannual_count"], 180, C.UI_LABEL_GOAL_SEMIANNUAL),
+        width="stretch",
     )
 
-    by_captador_base = signed_df_full.drop_duplicates(subset=["_pid"])[
-        [C.COL_INT_CAPTADOR, "_pid"]
-    ]
-    by_captador = by_captador_base[C.COL_INT_CAPTADOR].value_counts().reset_index()
-    by_captador.columns = [C.UI_LABEL_CAPTADOR, C.UI_LABEL_PARTNERS]
-    pie_fig = px.pie(
-        by_captador,
-        names=C.UI_LABEL_CAPTADOR,
-        values=C.UI_LABEL_PARTNERS,
-        title=C.UI_LABEL_CONTRACTS_BY_CAPTADOR,
-        color_discrete_sequence=px.colors.sequential.Pinkyl,
-    )
-    st.plotly_chart(pie_fig, width="stretch")
-
-    df_status = df.copy()
-    df_status["_pid"] = df_status[C.COL_INT_PARTNER].astype(str).str.strip()
-    df_status["_pid"] = df_status["_pid"].where(
-        df_status["_pid"] != "",
-        df_status[C.COL_INT_CEP].astype(str).str.strip(),
-    )
-    df_status["_pid"] = df_status["_pid"].where(
-        df_status["_pid"] != "",
-        df_status[C.COL_INT_CITY].astype(str).str.strip()
-        + "|"
-        + df_status[C.COL_INT_STATE].astype(str).str.strip(),
-    )
-    rank_map = {C.STATUS_ASSINADO: 2, C.STATUS_AGUARDANDO: 1, C.STATUS_CANCELADO: 0}
-    df_status["_rank"] = df_status[C.COL_INT_STATUS].map(rank_map).fillna(-1)
-    df_partner = df_status.sort_values("_rank", ascending=False).drop_duplicates(
-        subset=["_pid"]
-    )
-    status_counts_dedup = df_partner[C.COL_INT_STATUS].value_counts()
-    status_df = status_counts_dedup.reindex(
-        [C.STATUS_ASSINADO, C.STATUS_AGUARDANDO, C.STATUS_CANCELADO], fill_value=0
-    ).reset_index()
-    status_df.columns = [C.UI_LABEL_STATUS, C.UI_LABEL_QUANTITY]
-    bar_fig = px.bar(
-        status_df[status_df[C.UI_LABEL_STATUS].isin([C.STATUS_ASSINADO, C.STATUS_AGUARDANDO])],
-        x=C.UI_LABEL_STATUS,
-        y=C.UI_LABEL_QUANTITY,
-        title=C.UI_LABEL_SIGNED_VS_WAITING,
-        color=C.UI_LABEL_STATUS,
-        color_discrete_map={
-            C.STATUS_ASSINADO: C.COLOR_PRIMARY,
-            C.STATUS_AGUARDANDO: C.COLOR_SECONDARY,
-        },
-    )
-    st.plotly_chart(bar_fig, width="stretch")
-
-    signed_only = df[df[C.COL_INT_STATUS] == C.STATUS_ASSINADO].copy()
-    signed_only = signed_only.dropna(subset=[C.COL_INT_DT])
-    signed_only["_pid"] = signed_only[C.COL_INT_PARTNER].astype(str).str.strip()
-    signed_only["_pid"] = signed_only["_pid"].where(
-        signed_only["_pid"] != "",
-        signed_only[C.COL_INT_CEP].astype(str).str.strip(),
-    )
-    signed_only["_pid"] = signed_only["_pid"].where(
-        signed_only["_pid"] != "",
-        signed_only[C.COL_INT_CITY].astype(str).str.strip()
-        + "|"
-        + signed_only[C.COL_INT_STATE].astype(str).str.strip(),
-    )
-    signed_only["_ano"] = signed_only[C.COL_INT_DT].dt.year
-    signed_only["_mes"] = signed_only[C.COL_INT_DT].dt.month
-    monthly = signed_only.groupby(["_ano", "_mes"])[["_pid"]].nunique().reset_index()
-    monthly = monthly.rename(columns={"_pid": C.UI_LABEL_CONTRACTS})
-    
-    if not monthly.empty:
-        monthly[C.UI_LABEL_MONTH] = monthly.apply(
-            lambda r: f"{C.MONTH_NAMES.get(int(r['_mes']), str(int(r['_mes'])))} {int(r['_ano'])}",
-            axis=1,
-        )
-    else:
-        monthly[C.UI_LABEL_MONTH] = pd.Series(dtype='string')
-        
-    monthly = monthly.sort_values(["_ano", "_mes"])
-    fig_month = px.bar(
-        monthly,
-        x=C.UI_LABEL_MONTH,
-        y=C.UI_LABEL_CONTRACTS,
-        title=C.UI_LABEL_SIGNED_BY_MONTH,
-        color_discrete_sequence=[C.COLOR_PRIMARY],
-        custom_data=["_ano", "_mes"],
-    )
-    
-    # Meta Visual
-    fig_month.add_hline(
-        y=C.GOAL_MONTHLY_CONTRACTS, 
-        line_dash="dash", 
-        line_color="green", 
-        annotation_text="Meta",
-        annotation_position="top right"
-    )
+    st.plotly_chart(_pie_by_captador(m["captador_rows"]), width="stretch")
+    st.plotly_chart(_status_bar(m["status_rows"]), width="stretch")
+    fig_month = _monthly_bar(m["monthly_rows"])
 
     # Detalhamento Diário (Interativo)
     event = st.plotly_chart(
@@ -264,27 +380,17 @@ def render(df: pd.DataFrame, end_date: date, selected_month: int | None):
             x_val = point["x"]
             try:
                 # Expected format: "MonthName Year"
-                parts = x_val.split(' ')
+                parts = x_val.rsplit(" ", 1)
                 if len(parts) == 2:
-                    m_name = parts[0]
-                    y_str = parts[1]
-                    target_year = int(y_str)
-                    
-                    # Reverse lookup for month
-                    for k, v in C.MONTH_NAMES.items():
-                        if v == m_name:
-                            target_month = k
-                            break
+                    target_year = int(parts[1])
+                    target_month = _MONTH_NAME_TO_NUM.get(parts[0], target_month)
             except Exception:
                 pass
 
-    if target_year and target_month:
-        daily_mask = (signed_only["_ano"] == target_year) & (signed_only["_mes"] == target_month)
-        daily_df = signed_only[daily_mask].copy()
-        
-        # Agrupar por dia
-        daily_counts = daily_df.groupby(daily_df[C.COL_INT_DT].dt.day)[C.COL_INT_PARTNER].nunique().reset_index()
-        daily_counts.columns = ["Dia", C.UI_LABEL_CONTRACTS]
+    daily = m["daily"]
+    if target_year and target_month and not daily.empty:
+        daily_mask = (daily["_ano"] == target_year) & (daily["_mes"] == target_month)
+        daily_counts = daily.loc[daily_mask, ["Dia", C.UI_LABEL_CONTRACTS]]
         
         month_name = C.MONTH_NAMES.get(target_month, str(target_month))
         
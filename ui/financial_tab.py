@@ -1,101 +1,160 @@
 import streamlit as st
+import hashlib
 import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 from datetime import date
-import datetime
 import constants as C
+from ui.components import safe_pct, safe_ratio
 
 
-def render(
-    df: pd.DataFrame, full_df: pd.DataFrame, end_date: date, selected_month: int | None
-):
-    total = df[C.COL_INT_VALOR].sum()
-    parceiros = (df[C.COL_INT_VALOR] * df[C.COL_INT_COMISSAO]).sum()
-    equipe = C.COMMISSION_RATE_TEAM * (total - parceiros)
-    liquido = total - parceiros - equipe
-
-    # Novos KPIs
-    today = date.today()
-    fat_hoje = df[df[C.COL_INT_DATA].dt.date == today][C.COL_INT_VALOR].sum()
-    start_of_week = today - datetime.timedelta(days=today.weekday())
-    end_of_week = start_of_week + datetime.timedelta(days=6)
-    fat_semana = df[(df[C.COL_INT_DATA].dt.date >= start_of_week) & (df[C.COL_INT_DATA].dt.date <= end_of_week)][C.COL_INT_VALOR].sum()
-    start_of_month = today.replace(day=1)
-    fat_mes = df[df[C.COL_INT_DATA].dt.date >= start_of_month][C.COL_INT_VALOR].sum()
+# The aggregates below are cached on their inputs, so reruns triggered by
+# unrelated widgets (e.g. the simulator input) skip the pandas work. Each
+# entry is keyed on a full filtered frame, so the caches are bounded.
+@st.cache_data(show_spinner=False, max_entries=16)
+def _compute_kpis(df: pd.DataFrame, today: date) -> dict:
+    # Day-precision datetime64 compares instead of `.dt.date` object arrays;
+    # NaT never matches
+    days = df[C.COL_INT_DATA].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    today_d = np.datetime64(today, "D")
+    start_of_week = today_d - today.weekday()
+    start_of_month = np.datetime64(today.replace(day=1), "D")
 
-    new_k1, new_k2, new_k3 = st.columns(3)
-    new_k1.metric(C.UI_LABEL_REVENUE_TODAY, f"R$ {fat_hoje:,.2f}")
-    new_k2.metric(C.UI_LABEL_REVENUE_WEEK, f"R$ {fat_semana:,.2f}")
-    new_k3.metric(C.UI_LABEL_REVENUE_MONTH, f"R$ {fat_mes:,.2f}")
+    # NaN counts as 0, matching pandas' skipna sums
+    valor = np.nan_to_num(df[C.COL_INT_VALOR].to_numpy(dtype=float))
+    comissao = np.nan_to_num(df[C.COL_INT_COMISSAO].to_numpy(dtype=float))
+    if df[C.COL_INT_DATA].is_monotonic_increasing:
+        # Sorted dates (no NaT): each window is a contiguous slice, bounded
+        # by bisection instead of a full-column mask
+        i_today, j_today, i_week, j_week, i_month = np.searchsorted(
+            days,
+            [today_d, today_d + 1, start_of_week, start_of_week + 7, start_of_month],
+        )
+        total, parceiros = float(valor.sum()), float(comissao @ valor)
+        fat_hoje = float(valor[i_today:j_today].sum())
+        fat_semana = float(valor[i_week:j_week].sum())
+        fat_mes = float(valor[i_month:].sum())
+    else:
+        # All five sums as one matrix-vector product over the value column
+        weights = np.stack(
+            [
+                np.ones_like(valor),
+                comissao,
+                days == today_d,
+                (days >= start_of_week) & (days <= start_of_week + 6),
+                days >= start_of_month,
+            ]
+        )
+        total, parceiros, fat_hoje, fat_semana, fat_mes = (weights @ valor).tolist()
+    return {
+        "total": total,
+        "parceiros": parceiros,
+        "fat_hoje": fat_hoje,
+        "fat_semana": fat_semana,
+        "fat_mes": fat_mes,
+    }
 
-    c1, c2, c3, c4 = st.columns(4)
-    c1.metric(C.UI_LABEL_TOTAL_REVENUE, f"R$ {total:,.2f}")
-    c2.metric(C.UI_LABEL_PARTNER_COMMISSION, f"R$ {parceiros:,.2f}")
-    c3.metric(f"{C.UI_LABEL_TEAM_COMMISSION_BASE} ({int(C.COMMISSION_RATE_TEAM*100)}%)", f"R$ {equipe:,.2f}")
-    c4.metric(C.UI_LABEL_NET_REVENUE, f"R$ {liquido:,.2f}")
 
-    daily = df.groupby(df[C.COL_INT_DATA].dt.date)[C.COL_INT_VALOR].sum().reset_index()
+@st.cache_data(show_spinner=False, max_entries=16)
+def _daily(df: pd.DataFrame) -> pd.DataFrame:
+    # Group on datetime64 days (int64 hashing) rather than boxed `date` objects
+    daily = df.groupby(df[C.COL_INT_DATA].dt.floor("D"))[C.COL_INT_VALOR].sum().reset_index()
     daily.columns = [C.COL_INT_DATA, C.COL_INT_VALOR]
-    st.plotly_chart(
-        px.line(daily, x=C.COL_INT_DATA, y=C.COL_INT_VALOR, title=C.UI_LABEL_DAILY_REVENUE),
-        width="stretch",
-    )
+    return daily
 
-    m = df.dropna(subset=[C.COL_INT_DATA]).copy()
-    m["_ano"] = m[C.COL_INT_DATA].dt.year
-    m["_mes"] = m[C.COL_INT_DATA].dt.month
-    monthly = m.groupby(["_ano", "_mes"])[C.COL_INT_VALOR].sum().reset_index()
-    if not monthly.empty:
-        monthly[C.UI_LABEL_MONTH] = monthly.apply(
-            lambda r: f"{C.MONTH_NAMES.get(int(r['_mes']), str(int(r['_mes'])))} {int(r['_ano'])}",
-            axis=1,
-        )
-    else:
-        monthly[C.UI_LABEL_MONTH] = pd.Series(dtype='string')
-
-    monthly = monthly.sort_values(["_ano", "_mes"])
-    st.plotly_chart(
-        px.bar(
-            monthly,
-            x=C.UI_LABEL_MONTH,
-            y=C.COL_INT_VALOR,
-            title=C.UI_LABEL_MONTHLY_REVENUE,
-            color_discrete_sequence=[C.COLOR_PRIMARY],
-        ),
-        width="stretch",
-    )
 
-    now = date.today()
-    focus_year = end_date.year if isinstance(end_date, date) else now.year
-    focus_month = selected_month if selected_month is not None else now.month
-    prev_year = focus_year if focus_month > 1 else focus_year - 1
-    prev_month = focus_month - 1 if focus_month > 1 else 12
-    cur_mask = (full_df[C.COL_INT_DATA].dt.year == focus_year) & (
-        full_df[C.COL_INT_DATA].dt.month == focus_month
-    )
-    prev_mask = (full_df[C.COL_INT_DATA].dt.year == prev_year) & (
-        full_df[C.COL_INT_DATA].dt.month == prev_month
+@st.cache_data(show_spinner=False, max_entries=16)
+def _monthly(df: pd.DataFrame) -> pd.DataFrame:
+    # One monthly period key instead of year/month columns on a copy; the
+    # groupby drops NaT and returns the periods in order
+    periods = df[C.COL_INT_DATA].dt.to_period("M")
+    monthly = df.groupby(periods)[C.COL_INT_VALOR].sum().reset_index()
+    month_num = monthly[C.COL_INT_DATA].dt.month
+    monthly[C.UI_LABEL_MONTH] = (
+        month_num.map(C.MONTH_NAMES).fillna(month_num.astype(str))
+        + " "
+        + monthly[C.COL_INT_DATA].dt.year.astype(str)
     )
-    cur_total_month = float(full_df.loc[cur_mask, C.COL_INT_VALOR].sum())
-    prev_total_month = float(full_df.loc[prev_mask, C.COL_INT_VALOR].sum())
-    diff = cur_total_month - prev_total_month
-    progress_pct = (
-        (cur_total_month / prev_total_month * 100.0) if prev_total_month > 0 else None
-    )
-    k1, k2, k3 = st.columns(3)
-    k1.metric(C.UI_LABEL_REVENUE_CURRENT_MONTH, f"R$ {cur_total_month:,.2f}")
-    k2.metric(C.UI_LABEL_GOAL_LAST_MONTH, f"R$ {prev_total_month:,.2f}")
-    k3.metric(
-        C.UI_LABEL_VS_LAST_MONTH_REV_UP if diff > 0 else C.UI_LABEL_VS_LAST_MONTH_REV_DOWN,
-        f"R$ {abs(diff):,.2f}",
-        delta=(f"{progress_pct:.1f}%" if progress_pct is not None else None),
+    return monthly
+
+
+def _month_rollup(dates: np.ndarray, valor: np.ndarray) -> pd.Series:
+    """
+    Revenue per calendar month as a Period-indexed Series. Month ordinals
+    from datetime64[M] feed a single weighted bincount, so large frames need
+    no groupby hashing.
+    """
+    months = dates.astype("datetime64[M]")
+    ok = ~np.isnat(months) & ~np.isnan(valor)
+    if not ok.any():
+        return pd.Series(dtype=float)
+    ordinals = months[ok].astype(np.int64)
+    base = int(ordinals.min())
+    sums = np.bincount(ordinals - base, weights=valor[ok])
+    index = pd.period_range(start=pd.Period(ordinal=base, freq="M"), periods=sums.size)
+    return pd.Series(sums, index=index)
+
+
+# Figures are cached as resources on the (small) aggregated frames, so reruns
+# that leave them unchanged reuse the same Figure instead of rebuilding it
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _daily_line(daily: pd.DataFrame) -> go.Figure:
+    return px.line(daily, x=C.COL_INT_DATA, y=C.COL_INT_VALOR, title=C.UI_LABEL_DAILY_REVENUE)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _monthly_bar(monthly: pd.DataFrame) -> go.Figure:
+    return px.bar(
+        monthly,
+        x=C.UI_LABEL_MONTH,
+        y=C.COL_INT_VALOR,
+        title=C.UI_LABEL_MONTHLY_REVENUE,
+        color_discrete_sequence=[C.COLOR_PRIMARY],
     )
 
+
+def _session_month_rollup(full_df: pd.DataFrame) -> pd.Series:
+    """
+    `_month_rollup` of `full_df`, kept in `st.session_state` and rebuilt only
+    when the date/value buffers change, so month-filter and simulator reruns
+    reuse it. The fingerprint is a blake2b digest of the raw buffers.
+    """
+    dates = full_df[C.COL_INT_DATA].to_numpy(dtype="datetime64[ns]")
+    valor = full_df[C.COL_INT_VALOR].to_numpy(dtype=float)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(dates.view(np.int64).tobytes())
+    h.update(valor.tobytes())
+    fp = h.hexdigest()
+    if st.session_state.get("_month_fp") != fp:
+        st.session_state["_month_totals"] = _month_rollup(dates, valor)
+        st.session_state["_month_fp"] = fp
+    return st.session_state["_month_totals"]
+
+
+def _month_totals(
+    monthly_totals: pd.Series, focus_year: int, focus_month: int
+) -> tuple[float, float]:
+    """Revenue of the focus month and of the month before it."""
+    cur_key = pd.Period(year=focus_year, month=focus_month, freq="M")
+    cur_total_month = float(monthly_totals.get(cur_key, 0.0))
+    prev_total_month = float(monthly_totals.get(cur_key - 1, 0.0))
+    return cur_total_month, prev_total_month
+
+
+@st.fragment
+def _simulator(
+    total: float, parceiros: float, cur_total_month: float, prev_total_month: float
+):
+    """
+    Revenue simulator. Runs as a fragment, so moving the input only reruns
+    this block instead of the whole tab.
+    """
     st.markdown(C.UI_LABEL_SIMULATOR_TITLE)
     sim_add = st.number_input(
         C.UI_LABEL_SIMULATOR_INPUT, min_value=0.0, step=100.0, value=0.0
     )
-    avg_comissao = (parceiros / total) if total > 0 else 0.0
+    avg_comissao = safe_ratio(parceiros, total)
     sim_total = total + sim_add
     sim_parceiros = parceiros + sim_add * avg_comissao
     sim_equipe = C.COMMISSION_RATE_TEAM * (sim_total - sim_parceiros)
@@ -107,11 +166,7 @@ def render(
     s4.metric(C.UI_LABEL_SIMULATOR_NET, f"R$ {sim_liquido:,.2f}")
     cur_total_month_sim = cur_total_month + sim_add
     diff_sim = cur_total_month_sim - prev_total_month
-    progress_pct_sim = (
-        (cur_total_month_sim / prev_total_month * 100.0)
-        if prev_total_month > 0
-        else None
-    )
+    progress_pct_sim = safe_pct(cur_total_month_sim, prev_total_month)
     st.metric(
         (
             C.UI_LABEL_SIMULATOR_VS_LAST_UP
@@ -121,3 +176,55 @@ def render(
         f"R$ {abs(diff_sim):,.2f}",
         delta=(f"{progress_pct_sim:.1f}%" if progress_pct_sim is not None else None),
     )
+
+
+def render(
+    df: pd.DataFrame,
+    full_df: pd.DataFrame,
+    end_date: date | None,
+    selected_month: int | None,
+):
+    today = date.today()
+    kpis = _compute_kpis(df, today)
+    total = kpis["total"]
+    parceiros = kpis["parceiros"]
+    equipe = C.COMMISSION_RATE_TEAM * (total - parceiros)
+    liquido = total - parceiros - equipe
+
+    # Novos KPIs
+    fat_hoje = kpis["fat_hoje"]
+    fat_semana = kpis["fat_semana"]
+    fat_mes = kpis["fat_mes"]
+
+    new_k1, new_k2, new_k3 = st.columns(3)
+    new_k1.metric(C.UI_LABEL_REVENUE_TODAY, f"R$ {fat_hoje:,.2f}")
+    new_k2.metric(C.UI_LABEL_REVENUE_WEEK, f"R$ {fat_semana:,.2f}")
+    new_k3.metric(C.UI_LABEL_REVENUE_MONTH, f"R$ {fat_mes:,.2f}")
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric(C.UI_LABEL_TOTAL_REVENUE, f"R$ {total:,.2f}")
+    c2.metric(C.UI_LABEL_PARTNER_COMMISSION, f"R$ {parceiros:,.2f}")
+    c3.metric(f"{C.UI_LABEL_TEAM_COMMISSION_BASE} ({int(C.COMMISSION_RATE_TEAM*100)}%)", f"R$ {equipe:,.2f}")
+    c4.metric(C.UI_LABEL_NET_REVENUE, f"R$ {liquido:,.2f}")
+
+    st.plotly_chart(_daily_line(_daily(df)), width="stretch")
+    st.plotly_chart(_monthly_bar(_monthly(df)), width="stretch")
+
+    # Caller passes a `date` or None (month is 1-12 or None), so `or` suffices
+    focus_year = (end_date or today).year
+    focus_month = selected_month or today.month
+    cur_total_month, prev_total_month = _month_totals(
+        _session_month_rollup(full_df), focus_year, focus_month
+    )
+    diff = cur_total_month - prev_total_month
+    progress_pct = safe_pct(cur_total_month, prev_total_month)
+    k1, k2, k3 = st.columns(3)
+    k1.metric(C.UI_LABEL_REVENUE_CURRENT_MONTH, f"R$ {cur_total_month:,.2f}")
+    k2.metric(C.UI_LABEL_GOAL_LAST_MONTH, f"R$ {prev_total_month:,.2f}")
+    k3.metric(
+        C.UI_LABEL_VS_LAST_MONTH_REV_UP if diff > 0 else C.UI_LABEL_VS_LAST_MONTH_REV_DOWN,
+        f"R$ {abs(diff):,.2f}",
+        delta=(f"{progress_pct:.1f}%" if progress_pct is not None else None),
+    )
+
+    _simulator(total, parceiros, cur_total_month, prev_total_month)
@@ -1,8 +1,69 @@
 import streamlit as st
+import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import constants as C
 import forecasting
 
+# Horizon label -> forecast days; the key order is the selectbox order
+_HORIZON_MAP = {
+    C.UI_LABEL_HORIZON_1W: 7,
+    C.UI_LABEL_HORIZON_2W: 14,
+    C.UI_LABEL_HORIZON_3W: 21,
+    C.UI_LABEL_HORIZON_1M: 30,
+    C.UI_LABEL_HORIZON_3M: 90,
+    C.UI_LABEL_HORIZON_6M: 180,
+    C.UI_LABEL_HORIZON_1Y: 365,
+}
+_HORIZON_OPTIONS = list(_HORIZON_MAP)
+
+
+def _forecast_with_insights(
+    df, date_col: str, value_col: str, algo: str, days: int, is_currency: bool = False
+):
+    """
+    Forecast, its insights text and the historical total. The forecast itself
+    is memoized by `generate_forecast`; only the insights text is cached
+    here, on the small daily/forecast frames. Callers pass only the date and
+    value columns, which keeps the fingerprint cheap.
+    """
+    with st.spinner(C.UI_LABEL_GENERATING_FORECAST):
+        final_df, daily = forecasting.generate_forecast(
+            df, date_col, value_col, algo, days, return_daily=True
+        )
+    insights = _insights(daily, final_df, date_col, value_col, is_currency)
+    # Over the raw rows (undated ones included), not the daily series
+    return final_df, insights, df[value_col].sum()
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _insights(
+    daily: pd.DataFrame,
+    final_df: pd.DataFrame,
+    date_col: str,
+    value_col: str,
+    is_currency: bool,
+) -> str:
+    return forecasting.generate_smart_insights(
+        daily, date_col, value_col, final_df, is_currency=is_currency, daily=daily
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _forecast_line(final_df, x: str, y: str, title: str) -> go.Figure:
+    """History/forecast line chart, reused while the forecast is unchanged."""
+    return px.line(
+        final_df,
+        x=x,
+        y=y,
+        color="Type",
+        title=title,
+        color_discrete_map={
+            C.UI_LABEL_HISTORY: C.COLOR_PRIMARY,
+            C.UI_LABEL_FORECAST: C.COLOR_FORECAST,
+        },
+    )
+
 
 def render(contracts_df, faturamento_df):
     t1, t2 = st.tabs([C.TAB_NAME_CONTRACTS, C.TAB_NAME_FINANCIAL])
@@ -18,37 +79,22 @@ def render(contracts_df, faturamento_df):
         with c2:
             horizon_label = st.selectbox(
                 C.UI_LABEL_HORIZON,
-                [
-                    C.UI_LABEL_HORIZON_1W,
-                    C.UI_LABEL_HORIZON_2W,
-                    C.UI_LABEL_HORIZON_3W,
-                    C.UI_LABEL_HORIZON_1M,
-                    C.UI_LABEL_HORIZON_3M,
-                    C.UI_LABEL_HORIZON_6M,
-                    C.UI_LABEL_HORIZON_1Y,
-                ],
+                _HORIZON_OPTIONS,
                 key="forecast_horizon_contracts",
             )
             
         # Backtesting Button
         run_bt = st.button("🧪 Rodar Backtest (Validar Precisão)", key="bt_contracts")
 
-        horizon_map = {
-            C.UI_LABEL_HORIZON_1W: 7,
-            C.UI_LABEL_HORIZON_2W: 14,
-            C.UI_LABEL_HORIZON_3W: 21,
-            C.UI_LABEL_HORIZON_1M: 30,
-            C.UI_LABEL_HORIZON_3M: 90,
-            C.UI_LABEL_HORIZON_6M: 180,
-            C.UI_LABEL_HORIZON_1Y: 365,
-        }
-        days = horizon_map[horizon_label]
-
-        signed_df = contracts_df[
-            contracts_df[C.COL_INT_STATUS] == C.STATUS_ASSINADO
-        ].copy()
-        df_input = signed_df.copy()
-        df_input[C.UI_LABEL_CONTRACTS] = 1
+        days = _HORIZON_MAP[horizon_label]
+
+        # Only the columns the model reads: each signed contract counts 1
+        signed_dates = contracts_df.loc[
+            contracts_df[C.COL_INT_STATUS] == C.STATUS_ASSINADO, C.COL_INT_DT
+        ]
+        df_input = pd.DataFrame(
+            {C.COL_INT_DT: signed_dates.to_numpy(), C.UI_LABEL_CONTRACTS: 1}
+        )
         
         # --- Backtesting Logic ---
         if run_bt:
@@ -83,13 +129,15 @@ def render(contracts_df, faturamento_df):
         # -------------------------
 
         try:
-            final_df = forecasting.generate_forecast(
-                df_input, C.COL_INT_DT, C.UI_LABEL_CONTRACTS, algo, days
+            final_df, insights, total_historical = _forecast_with_insights(
+                df_input,
+                C.COL_INT_DT,
+                C.UI_LABEL_CONTRACTS,
+                algo,
+                days,
             )
-            future_mask = final_df["Type"] == C.UI_LABEL_FORECAST
-            total_predicted = int(final_df[future_mask][C.UI_LABEL_CONTRACTS].sum())
-            total_historical = len(signed_df)
-            total_final = total_historical + total_predicted
+            total_predicted = int(final_df.attrs["forecast_summary"]["future_sum"])
+            total_final = int(total_historical) + total_predicted
 
             m1, m2 = st.columns(2)
             m1.metric(label=f"{C.UI_LABEL_NEW_CONTRACTS} ({horizon_label})", value=total_predicted)
@@ -99,23 +147,15 @@ def render(contracts_df, faturamento_df):
                 delta=f"+{total_predicted} novos",
             )
 
-            fig = px.line(
+            fig = _forecast_line(
                 final_df,
-                x=C.COL_INT_DT,
-                y=C.UI_LABEL_CONTRACTS,
-                color="Type",
-                title=f"{C.UI_LABEL_FORECAST_CONTRACTS_TITLE} - {algo}",
-                color_discrete_map={
-                    C.UI_LABEL_HISTORY: C.COLOR_PRIMARY,
-                    C.UI_LABEL_FORECAST: C.COLOR_FORECAST,
-                },
+                C.COL_INT_DT,
+                C.UI_LABEL_CONTRACTS,
+                f"{C.UI_LABEL_FORECAST_CONTRACTS_TITLE} - {algo}",
             )
             st.plotly_chart(fig, width="stretch")
 
             st.markdown("---")
-            insights = forecasting.generate_smart_insights(
-                df_input, C.COL_INT_DT, C.UI_LABEL_CONTRACTS, final_df
-            )
             st.info(insights)
         except Exception as e:
             st.error(f"{C.UI_LABEL_ERROR_FORECAST}: {e}")
@@ -135,35 +175,17 @@ def render(contracts_df, faturamento_df):
         with c2:
             horizon_label_f = st.selectbox(
                 C.UI_LABEL_HORIZON,
-                [
-                    C.UI_LABEL_HORIZON_1W,
-                    C.UI_LABEL_HORIZON_2W,
-                    C.UI_LABEL_HORIZON_3W,
-                    C.UI_LABEL_HORIZON_1M,
-                    C.UI_LABEL_HORIZON_3M,
-                    C.UI_LABEL_HORIZON_6M,
-                    C.UI_LABEL_HORIZON_1Y,
-                ],
+                _HORIZON_OPTIONS,
                 key="forecast_horizon_faturamento",
             )
             
         # Backtesting Button
         run_bt_f = st.button("🧪 Rodar Backtest (Validar Precisão)", key="bt_faturamento")
 
-        horizon_map = {
-            C.UI_LABEL_HORIZON_1W: 7,
-            C.UI_LABEL_HORIZON_2W: 14,
-            C.UI_LABEL_HORIZON_3W: 21,
-            C.UI_LABEL_HORIZON_1M: 30,
-            C.UI_LABEL_HORIZON_3M: 90,
-            C.UI_LABEL_HORIZON_6M: 180,
-            C.UI_LABEL_HORIZON_1Y: 365,
-        }
-        days_f = horizon_map[horizon_label_f]
-
-        df_input_f = faturamento_df.dropna(
-            subset=[C.COL_INT_DATA, C.COL_INT_VALOR]
-        ).copy()
+        days_f = _HORIZON_MAP[horizon_label_f]
+
+        # Select the two model columns first so dropna only copies those
+        df_input_f = faturamento_df[[C.COL_INT_DATA, C.COL_INT_VALOR]].dropna()
         
         # --- Backtesting Logic ---
         if run_bt_f:
@@ -198,14 +220,16 @@ def render(contracts_df, faturamento_df):
         # -------------------------
 
         try:
-            final_df_f = forecasting.generate_forecast(
-                df_input_f, C.COL_INT_DATA, C.COL_INT_VALOR, algo_f, days_f
-            )
-            future_mask_f = final_df_f["Type"] == C.UI_LABEL_FORECAST
-            total_predicted_f = float(
-                final_df_f.loc[future_mask_f, C.COL_INT_VALOR].sum()
+            final_df_f, insights_f, total_historical_f = _forecast_with_insights(
+                df_input_f,
+                C.COL_INT_DATA,
+                C.COL_INT_VALOR,
+                algo_f,
+                days_f,
+                is_currency=True,
             )
-            total_historical_f = float(df_input_f[C.COL_INT_VALOR].sum())
+            total_predicted_f = final_df_f.attrs["forecast_summary"]["future_sum"]
+            total_historical_f = float(total_historical_f)
             total_final_f = total_historical_f + total_predicted_f
 
             m1, m2 = st.columns(2)
@@ -219,27 +243,15 @@ def render(contracts_df, faturamento_df):
                 delta=f"+R$ {total_predicted_f:,.2f}",
             )
 
-            fig_f = px.line(
+            fig_f = _forecast_line(
                 final_df_f,
-                x=C.COL_INT_DATA,
-                y=C.COL_INT_VALOR,
-                color="Type",
-                title=f"{C.UI_LABEL_FORECAST_REVENUE_TITLE} - {algo_f}",
-                color_discrete_map={
-                    C.UI_LABEL_HISTORY: C.COLOR_PRIMARY,
-                    C.UI_LABEL_FORECAST: C.COLOR_FORECAST,
-                },
+                C.COL_INT_DATA,
+                C.COL_INT_VALOR,
+                f"{C.UI_LABEL_FORECAST_REVENUE_TITLE} - {algo_f}",
             )
             st.plotly_chart(fig_f, width="stretch")
 
             st.markdown("---")
-            insights_f = forecasting.generate_smart_insights(
-                df_input_f,
-                C.COL_INT_DATA,
-                C.COL_INT_VALOR,
-                final_df_f,
-                is_currency=True,
-            )
             st.info(insights_f)
         except Exception as e:
             st.error(f"{C.UI_LABEL_ERROR_FORECAST}: {e}")
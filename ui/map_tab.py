@@ -62,11 +62,20 @@ def render(df: pd.DataFrame):
             
         success_count = 0
         
+        # Resolve every IBGE code in one cached call instead of one per city
+        ibge_codes = map_service.get_ibge_codes_bulk(
+            tuple(
+                (c, s)
+                for c, s in zip(unique_locations[C.COL_INT_CITY], unique_locations[C.COL_INT_STATE])
+                if c and s
+            )
+        )
+        
         for i, (idx, row) in enumerate(unique_locations.iterrows()):
             city, state = row[C.COL_INT_CITY], row[C.COL_INT_STATE]
             if city and state:
                 # 1. Get IBGE Code
-                ibge_code = map_service.get_ibge_code(city, state)
+                ibge_code = ibge_codes.get((city, state))
                 if ibge_code:
                     # 2. Get GeoJSON
                     geo_data = map_service.get_municipality_geojson(ibge_code)
@@ -165,7 +165,7 @@ def render(dados_df: pd.DataFrame):
             with st.spinner(C.UI_LABEL_COLLECTING_INDICATORS):
                 base = build_oportunidade_por_uf(dados_df, ufs_selected_det)
                 # Fetch ALL industries (Total)
-                inds = get_unidades_locais(base["id"].astype(str).tolist(), "all")
+                inds = get_unidades_locais(base["id"].astype(str).tolist())
                 det = base.merge(inds, on="id", how="left")
 
             if det.empty:
@@ -242,7 +242,7 @@ def render(dados_df: pd.DataFrame):
             ):
                 # Use Generic Data because Specific Data is unavailable reliably
                 base = build_oportunidade_por_uf(dados_df, ufs_selected_curso)
-                inds = get_unidades_locais(base["id"].astype(str).tolist(), "all")
+                inds = get_unidades_locais(base["id"].astype(str).tolist())
                 final = base.merge(inds, on="id", how="left")
                 final["unidades_locais"] = (
                     final["unidades_locais"].fillna(0).astype(int)
@@ -278,8 +278,8 @@ def render(dados_df: pd.DataFrame):
                 elif selected_area == "Saúde":
                     w_emp, w_pop = 0.4, 0.6  # Needs people
 
-                final["region_boost"] = final["regiao"].apply(
-                    lambda r: 1.2 if r in target_regions else 1.0
+                final["region_boost"] = np.where(
+                    final["regiao"].isin(target_regions), 1.2, 1.0
                 )
                 final["score_curso"] = (w_emp * norm_emp + w_pop * norm_pop) * final[
                     "region_boost"
@@ -466,7 +466,7 @@ def render(dados_df: pd.DataFrame):
                  base = build_oportunidade_por_uf(dados_df, states_in_sales)
                  
                  # Fetch companies
-                 inds = get_unidades_locais(base["id"].astype(str).tolist(), "all")
+                 inds = get_unidades_locais(base["id"].astype(str).tolist())
                  features = base.merge(inds, on="id", how="left")
                  
                  # Create match key